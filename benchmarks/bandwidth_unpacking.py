@@ -0,0 +1,73 @@
+"""Benchmark unpacking of bandwidths on scaled up `test_bandwidth` collection.
+
+Compares current implementation of `Adapter.__unpack_bandwidths` against previous row-wise implementation.
+
+Usage (from repository root):
+
+    PYTHONPATH=. python benchmarks/bandwidth_unpacking.py [--scale 200] [--repeat 3]
+"""
+import argparse
+import os
+import pathlib
+import timeit
+
+import pandas as pd
+
+ROOT = pathlib.Path(__file__).parent.parent
+os.environ.setdefault("COLLECTIONS_DIR", str(ROOT / "tests" / "test_data" / "test_collections"))
+os.environ.setdefault("STRUCTURES_DIR", str(ROOT / "tests" / "test_data" / "test_structures"))
+
+from data_adapter import collection, preprocessing  # noqa: E402
+
+COLLECTION = "test_bandwidth"
+PROCESS = "x2x_delivery_hydrogen_pipeline_retrofit_1"
+
+
+def unpack_bandwidths_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    """Previous implementation, iterating rows and setting cells one by one"""
+    if "bandwidth_type" not in df.columns:
+        return df
+    for index, row in df.iterrows():
+        bandwidth_keys = row["bandwidth_type"].keys()
+        for col in df.columns:
+            if col in bandwidth_keys and isinstance(row[col], list):
+                if row[col]:
+                    df.at[index, col] = row[col][0]
+                else:
+                    df.at[index, col] = None
+    return df
+
+
+def get_scaled_data(scale: int) -> pd.DataFrame:
+    """Returns exploded artifact data repeated `scale` times with unique index"""
+    artifact = collection.get_artifacts_from_collection(COLLECTION, PROCESS)[0]
+    df = artifact.read().explode("region")
+    df = pd.concat([df] * scale, ignore_index=True)
+    # Bandwidths are lists; copy them to prevent sharing cells between repetitions
+    for col in df.columns:
+        df[col] = [list(value) if isinstance(value, list) else value for value in df[col]]
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=200, help="Number of repetitions of artifact data")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timing runs (best is reported)")
+    args = parser.parse_args()
+
+    df = get_scaled_data(args.scale)
+    adapter = preprocessing.Adapter(COLLECTION)
+    unpack = adapter._Adapter__unpack_bandwidths  # noqa: SLF001
+
+    pd.testing.assert_frame_equal(unpack(df.copy()), unpack_bandwidths_rowwise(df.copy()))
+
+    rowwise = min(timeit.repeat(lambda: unpack_bandwidths_rowwise(df.copy()), number=1, repeat=args.repeat))
+    columnwise = min(timeit.repeat(lambda: unpack(df.copy()), number=1, repeat=args.repeat))
+    print(f"rows: {len(df)}, columns: {len(df.columns)}")
+    print(f"row-wise:    {rowwise:.4f}s")
+    print(f"column-wise: {columnwise:.4f}s")
+    print(f"speedup:     {rowwise / columnwise:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
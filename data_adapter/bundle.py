@@ -0,0 +1,350 @@
+"""Module to export preprocessed processes of a collection into a bundle and to load them again.
+
+A bundle is a folder holding scalars and timeseries of each process as parquet files
+together with a manifest (JSON) holding units, structure fields and collection versions.
+Index levels and data columns are stored as parquet columns, categorical columns as codes.
+Column labels, index names and dtypes are stored as JSON in parquet schema metadata
+and columns holding other python objects (dicts, lists, tuples, mixed values) are stored as JSON strings,
+thus, loaded processes equal the preprocessed ones. Tuples are marked in JSON in order to restore them.
+"""
+import collections
+import concurrent.futures
+import json
+import os
+import pathlib
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data_adapter import collection
+from data_adapter.preprocessing import WORKER_CHUNKS, Adapter, Process
+
+BUNDLE_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+
+# Key of pandas info (JSON) in parquet schema metadata
+BUNDLE_METADATA_KEY = b"data_adapter_bundle"
+
+# Key of JSON object holding items of a tuple
+TUPLE_KEY = "__tuple__"
+
+
+class BundleError(Exception):
+    """Raised if bundle cannot be written or loaded"""
+
+
+def export_bundle(
+    adapter: Adapter,
+    path: Union[str, pathlib.Path],
+    processes: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+) -> pathlib.Path:
+    """Preprocesses processes of adapter collection and writes them into a bundle.
+
+    Processes are written as soon as they are built, thus, only artifact data still needed
+    and processes waiting to be written are kept in memory.
+    If multiple workers are given, processes are built in a pool of worker processes
+    (see `Adapter.get_processes`) in batches of `workers * WORKER_CHUNKS` processes,
+    while processes of former batch are written by threads.
+
+    Parameters
+    ----------
+    adapter : Adapter
+        Adapter to preprocess processes with (collection, structure and units are taken from adapter)
+    path : Union[str, pathlib.Path]
+        Folder to write bundle into; former bundle in folder is replaced (its manifest is removed first)
+    processes : Optional[Iterable[str]]
+        Names of processes to export; defaults to all processes of collection
+    workers : Optional[int]
+        Number of worker processes to build processes with and number of threads to write files;
+        processes are built one by one in current process if not given (or 1), see `Adapter.iter_processes`
+
+    Returns
+    -------
+    pathlib.Path
+        Path to bundle manifest
+    """
+    pq = _import_pyarrow().parquet
+
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    if processes is None:
+        processes = sorted(collection.get_processes_from_collection(adapter.collection_name))
+    processes = list(processes)
+    positions = {name: position for position, name in enumerate(processes)}
+    # Manifest of former bundle is removed first, thus, bundle is invalid until new manifest has been written
+    manifest_path = path / MANIFEST_FILE
+    manifest_path.unlink(missing_ok=True)
+
+    entries = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or 1) as executor:
+        writes = collections.deque()
+        for name, process in _build_processes(adapter, processes, workers):
+            entries[name] = {kind: f"{positions[name]:05d}.{kind}.parquet" for kind in ("scalars", "timeseries")}
+            for kind in ("scalars", "timeseries"):
+                table = _to_table(getattr(process, kind))
+                writes.append(executor.submit(pq.write_table, table, path / entries[name][kind]))
+            entries[name].update(
+                units=process.units, inputs=process.inputs, outputs=process.outputs, parameters=process.parameters
+            )
+            # Wait for oldest writes, thus, number of tables waiting to be written is bounded
+            while len(writes) > 2 * (workers or 1) * WORKER_CHUNKS:
+                writes.popleft().result()
+        for write in writes:
+            write.result()
+
+    collection_meta = collection.get_collection_meta(adapter.collection_name)
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "collection": adapter.collection_name,
+        "units": adapter.units,
+        "artifacts": {
+            group: {artifact: info["latest_version"] for artifact, info in artifacts.items()}
+            for group, artifacts in collection_meta["artifacts"].items()
+        },
+        "processes": {name: entries[name] for name in processes},
+    }
+    # Files of former (larger) bundle are removed
+    written = {entry[kind] for entry in entries.values() for kind in ("scalars", "timeseries")}
+    for stale_path in path.glob("*.parquet"):
+        if stale_path.name not in written:
+            stale_path.unlink()
+    # Manifest is written last (and atomically), thus, a bundle with manifest is complete
+    temp_path = manifest_path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(temp_path, manifest_path)
+    return manifest_path
+
+
+def _build_processes(adapter: Adapter, processes: list[str], workers: Optional[int]) -> Iterator[tuple[str, Process]]:
+    """Yields processes built batch by batch in a pool of worker processes or one by one, if no workers given."""
+    if workers is None or workers <= 1:
+        yield from adapter.iter_processes(processes)
+        return
+    batch_size = workers * WORKER_CHUNKS
+    for start in range(0, len(processes), batch_size):
+        batch = processes[start:][:batch_size]
+        yield from adapter.get_processes(batch, workers=workers).items()
+
+
+def read_manifest(path: Union[str, pathlib.Path]) -> dict:
+    """Reads manifest of bundle.
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Folder of bundle
+
+    Returns
+    -------
+    dict
+        Manifest of bundle
+
+    Raises
+    ------
+    BundleError
+        if bundle is incomplete or has been written by an incompatible version
+    """
+    manifest_path = pathlib.Path(path) / MANIFEST_FILE
+    if not manifest_path.exists():
+        raise BundleError(f"Could not find bundle manifest '{manifest_path}'.")
+    with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get("version") != BUNDLE_VERSION:
+        raise BundleError(
+            f"Bundle '{path}' has version {manifest.get('version')}, but version {BUNDLE_VERSION} is needed. "
+            "Please export bundle again."
+        )
+    return manifest
+
+
+def load_bundle(
+    path: Union[str, pathlib.Path], processes: Optional[Iterable[str]] = None, workers: Optional[int] = None
+) -> dict[str, Process]:
+    """Loads processes from bundle.
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Folder of bundle
+    processes : Optional[Iterable[str]]
+        Names of processes to load; defaults to all processes in bundle
+    workers : Optional[int]
+        Number of threads to read parquet files with
+
+    Returns
+    -------
+    dict[str, Process]
+        Processes by name, in order of given processes (or order of export)
+
+    Raises
+    ------
+    BundleError
+        if bundle is incomplete or has been written by an incompatible version
+    KeyError
+        if any process cannot be found in bundle
+    """
+    pq = _import_pyarrow().parquet
+
+    path = pathlib.Path(path)
+    manifest = read_manifest(path)
+    if processes is None:
+        processes = list(manifest["processes"])
+    entries = {process: manifest["processes"][process] for process in processes}
+
+    def read_frame(filename: str) -> pd.DataFrame:
+        return _from_table(pq.read_table(path / filename))
+
+    filenames = [entry[kind] for entry in entries.values() for kind in ("scalars", "timeseries")]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or 1) as executor:
+        frames = dict(zip(filenames, executor.map(read_frame, filenames)))
+    return {
+        process: Process(
+            scalars=frames[entry["scalars"]],
+            timeseries=frames[entry["timeseries"]],
+            units=entry["units"],
+            inputs=entry["inputs"],
+            outputs=entry["outputs"],
+            parameters=entry["parameters"],
+        )
+        for process, entry in entries.items()
+    }
+
+
+def _is_json_column(series: pd.Series) -> bool:
+    """Returns True, if column cannot be stored as plain parquet column without loss."""
+    if series.dtype != object:
+        return False
+    return not all(isinstance(value, str) for value in series)
+
+
+def _encode_value(value):
+    """Returns value as JSON serializable object; tuples are stored as objects holding their items."""
+    if isinstance(value, tuple):
+        return {TUPLE_KEY: [_encode_value(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise BundleError(f"Cannot store dict with non-string keys in bundle: {value}")
+        return {key: _encode_value(item) for key, item in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise BundleError(f"Cannot store value {value!r} of type '{type(value).__name__}' in bundle.")
+
+
+def _decode_object(obj: dict):
+    if obj.keys() == {TUPLE_KEY}:
+        return tuple(obj[TUPLE_KEY])
+    return obj
+
+
+def _loads(text: str):
+    return json.loads(text, object_hook=_decode_object)
+
+
+def _encode_column(series: pd.Series) -> tuple:
+    """Returns arrow array and JSON info of dtype needed to restore column."""
+    pa = _import_pyarrow()
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Only codes are stored, categories are restored from info
+        categories = [_encode_value(category) for category in series.cat.categories]
+        info = {"dtype": "category", "categories": categories, "ordered": bool(series.cat.ordered)}
+        return pa.array(series.cat.codes.to_numpy()), info
+    if _is_json_column(series):
+        return pa.array([json.dumps(_encode_value(value)) for value in series], type=pa.string()), {"dtype": "json"}
+    return pa.Array.from_pandas(series), {"dtype": str(series.dtype)}
+
+
+def _decode_column(column, info: dict) -> pd.Series:
+    """Restores column written by `_encode_column`."""
+    if info["dtype"] == "category":
+        dtype = pd.CategoricalDtype(_loads(json.dumps(info["categories"])), ordered=info["ordered"])
+        return pd.Series(pd.Categorical.from_codes(column.to_numpy(zero_copy_only=False), dtype=dtype))
+    if info["dtype"] == "json":
+        return pd.Series([_loads(value) for value in column.to_pylist()], dtype=object)
+    return pd.Series(column.to_pandas().to_numpy()).astype(info["dtype"])
+
+
+def _encode_labels(labels: pd.Index) -> dict:
+    """Returns JSON info to restore column labels."""
+    if isinstance(labels, pd.RangeIndex):
+        return {"range": [labels.start, labels.stop, labels.step], "names": list(labels.names)}
+    return {
+        "labels": [_encode_value(label) for label in labels],
+        "names": list(labels.names),
+        "multi": isinstance(labels, pd.MultiIndex),
+        "dtype": str(labels.dtype),
+    }
+
+
+def _decode_labels(info: dict) -> pd.Index:
+    """Restores column labels from info written by `_encode_labels`."""
+    names = info["names"]
+    if "range" in info:
+        return pd.RangeIndex(*info["range"], name=names[0])
+    labels = _loads(json.dumps(info["labels"]))
+    if info["multi"]:
+        return pd.MultiIndex.from_tuples(labels, names=names)
+    return pd.Index(labels, dtype=info["dtype"], name=names[0], tupleize_cols=False)
+
+
+def _to_table(df: pd.DataFrame):
+    """Converts dataframe into arrow table; index levels and columns are named by position and restored from info."""
+    pa = _import_pyarrow()
+
+    arrays = {}
+    columns = []
+    for position in range(len(df.columns)):
+        arrays[str(position)], column_info = _encode_column(df.iloc[:, position])
+        columns.append(column_info)
+    if isinstance(df.index, pd.RangeIndex):
+        index = _encode_labels(df.index)
+    else:
+        index = {"names": list(df.index.names), "levels": [], "freq": getattr(df.index, "freqstr", None)}
+        for level in range(df.index.nlevels):
+            arrays[f"index_{level}"], level_info = _encode_column(df.index.get_level_values(level).to_series())
+            index["levels"].append(level_info)
+    # Dummy column keeps number of rows of dataframes without columns
+    table = pa.table(arrays) if arrays else pa.table({"": pa.nulls(len(df))})
+    info = {"columns": _encode_labels(df.columns), "dtypes": columns, "index": index}
+    return table.replace_schema_metadata({BUNDLE_METADATA_KEY: json.dumps(info)})
+
+
+def _from_table(table) -> pd.DataFrame:
+    """Restores dataframe from arrow table written by `_to_table`."""
+    info = json.loads(table.schema.metadata[BUNDLE_METADATA_KEY])
+    if "levels" in info["index"]:
+        levels = [
+            _decode_column(table.column(f"index_{level}"), level_info)
+            for level, level_info in enumerate(info["index"]["levels"])
+        ]
+        if len(levels) > 1:
+            index = pd.MultiIndex.from_arrays(levels, names=info["index"]["names"])
+        else:
+            index = pd.Index(levels[0], name=info["index"]["names"][0])
+            if isinstance(index, pd.DatetimeIndex) and info["index"]["freq"] is not None:
+                index.freq = info["index"]["freq"]
+    else:
+        index = _decode_labels(info["index"])
+    columns = {
+        position: _decode_column(table.column(str(position)), column_info).set_axis(index)
+        for position, column_info in enumerate(info["dtypes"])
+    }
+    df = pd.DataFrame(columns, index=index)
+    df.columns = _decode_labels(info["columns"])
+    return df
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError("You must install pyarrow in order to export or load bundles.")
+    return pyarrow
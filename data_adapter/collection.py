@@ -1,14 +1,21 @@
 """Module handles extraction of processes from databus collection."""
 import json
 import pathlib
+import dataclasses
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Optional, Union
+from typing import Collection, Iterable, Optional, Union
 
-import frictionless
 import pandas as pd
 
-from data_adapter import core, ontology, settings
+from data_adapter import core, ontology, readers, settings
+
+
+# Parsed collection metadata per collection.json file, together with file stats (mtime, size) at parsing time
+_COLLECTION_META_CACHE: dict[pathlib.Path, tuple[tuple[int, int], dict]] = {}
+_COLLECTION_META_CACHE_STATS = {"hits": 0, "misses": 0}
+# Interned artifacts per collections directory
+_ARTIFACTS: dict[tuple[pathlib.Path, "Artifact"], "Artifact"] = {}
 
 
 class CollectionError(Exception):
@@ -22,9 +29,13 @@ class DataType(IntEnum):
     Timeseries = 1
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Artifact:
-    """Holds information on artifact."""
+    """Holds information on artifact.
+
+    Artifact paths and metadata are resolved once and cached on the artifact.
+    Use `get_artifact` to get the shared (interned) instance of an artifact.
+    """
 
     collection: str
     group: str
@@ -33,34 +44,98 @@ class Artifact:
     filename: Optional[str] = None
     datatype: DataType = DataType.Scalar
     multiple_types: bool = False
+    _path: Optional[pathlib.Path] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _files: Optional[dict[str, str]] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _metadata: Optional[dict] = dataclasses.field(default=None, init=False, repr=False, compare=False)
 
     @property
     def path(self) -> pathlib.Path:
-        return settings.COLLECTIONS_DIR / self.collection / self.group / self.artifact / self.version
+        if self._path is None:
+            path = settings.COLLECTIONS_DIR / self.collection / self.group / self.artifact / self.version
+            object.__setattr__(self, "_path", path)
+        return self._path
+
+    @property
+    def csv_path(self) -> pathlib.Path:
+        if self.filename is None:
+            return self.path / self.get_filename(".csv")
+        return self.path / f"{self.filename}.csv"
+
+    @property
+    def json_path(self) -> pathlib.Path:
+        return self.path / self.get_filename(".json")
 
     @property
     def metadata(self) -> dict:
-        with open(self.path / self.get_filename(".json"), encoding="utf-8") as metadata_file:
-            return json.load(metadata_file)
+        """Metadata of artifact; read only once and shared, thus, must not be changed."""
+        if self._metadata is None:
+            with open(self.json_path, encoding="utf-8") as metadata_file:
+                object.__setattr__(self, "_metadata", json.load(metadata_file))
+        return self._metadata
 
     def get_filename(self, suffix: str) -> str:
-        for file in self.path.iterdir():
-            if file.suffix == suffix:
-                return file.name
-        raise FileNotFoundError(f"Artifact file with {suffix=} not found.")
+        if self._files is None:
+            files = {}
+            for file in self.path.iterdir():
+                files.setdefault(file.suffix, file.name)
+            object.__setattr__(self, "_files", files)
+        if suffix not in self._files:
+            raise FileNotFoundError(f"Artifact file with {suffix=} not found.")
+        return self._files[suffix]
 
     @property
     def data(self) -> pd.DataFrame:
-        metadata = self.metadata
-        fl_table_schema = core.reformat_oep_to_frictionless_schema(metadata["resources"][0]["schema"])
-        resource = frictionless.Resource(
-            name=metadata["name"],
-            profile="tabular-data-resource",
-            source=self.path / f"{self.filename}.csv",
-            schema=fl_table_schema,
-            format="csv",
-        )
-        return resource.to_pandas()
+        return self.read()
+
+    def read(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        filters: Optional[dict[str, Collection]] = None,
+        engine: Optional[str] = None,
+        use_cache: Optional[bool] = None,
+    ) -> pd.DataFrame:
+        """Reads artifact data.
+
+        Parameters
+        ----------
+        columns: Optional[Iterable[str]]
+            Only given columns are read; columns not found in artifact are ignored. If not set, all columns are read.
+        filters: Optional[dict[str, Collection]]
+            Only rows whose column values are in related collection of allowed values are read,
+            i.e. {"type": {"wind_onshore"}, "year": {2030, 2050}} (see `readers.get_filter_mask`).
+        engine: Optional[str]
+            Engine to read CSV with ("frictionless" or "pandas"). If not set, settings value CSV_ENGINE is used.
+        use_cache: Optional[bool]
+            Read data from (and write data to) columnar cache file next to CSV.
+            Cache files are kept per engine, thus, cached data has been parsed (and validated) by given engine.
+            If not set, settings value USE_ARTIFACT_CACHE is used.
+
+        Returns
+        -------
+        pd.DataFrame
+            Artifact data, indexed by primary key
+
+        Raises
+        ------
+        ReaderError
+            if engine is unknown
+        """
+        columns = None if columns is None else set(columns)
+        engine = settings.CSV_ENGINE if engine is None else engine
+        use_cache = settings.USE_ARTIFACT_CACHE if use_cache is None else use_cache
+        if engine not in readers.READERS:
+            raise readers.ReaderError(f"Unknown CSV engine '{engine}'. Choose one of {list(readers.READERS)}.")
+        if use_cache:
+            df = readers.read_cache(self.csv_path, self.metadata, columns, filters, engine=engine)
+            if df is not None:
+                return df
+            # Cache always holds all columns and rows
+            df = readers.READERS[engine](self.csv_path, self.metadata)
+            readers.write_cache(self.csv_path, self.metadata, df, engine=engine)
+            if filters:
+                df = df[readers.get_filter_mask(df, self.metadata, filters)]
+            return df if columns is None else df[[column for column in df.columns if column in columns]]
+        return readers.READERS[engine](self.csv_path, self.metadata, columns, filters)
 
     def get_subprocesses(self):
         """
@@ -73,7 +148,52 @@ class Artifact:
         List[str]
             List of subprocesses in given artifact
         """
-        return list(pd.read_csv(self.path / self.get_filename(".csv"), usecols=("type",))["type"])
+        return list(pd.read_csv(self.csv_path, usecols=("type",))["type"])
+
+
+def get_artifact(
+    collection: str,
+    group: str,
+    artifact: str,
+    version: str,
+    filename: Optional[str] = None,
+    datatype: DataType = DataType.Scalar,
+    multiple_types: bool = False,
+) -> Artifact:
+    """Returns interned artifact.
+
+    Artifacts are shared per collections directory and artifact attributes,
+    so resolved paths and parsed metadata are reused by all callers.
+
+    Parameters
+    ----------
+    collection: str
+        Collection name
+    group: str
+        Group name
+    artifact: str
+        Artifact name
+    version: str
+        Version of artifact
+    filename: Optional[str]
+        Name of artifact files (without suffix)
+    datatype: DataType
+        Scalar or timeseries
+    multiple_types: bool
+        Whether artifact holds multiple (sub-)processes
+
+    Returns
+    -------
+    Artifact
+        Interned artifact
+    """
+    new_artifact = Artifact(collection, group, artifact, version, filename, datatype, multiple_types)
+    return _ARTIFACTS.setdefault((settings.COLLECTIONS_DIR, new_artifact), new_artifact)
+
+
+def clear_artifact_cache():
+    """Clears interned artifacts and, thus, their cached paths and metadata."""
+    _ARTIFACTS.clear()
 
 
 def check_collection_meta(collection_meta: dict):
@@ -121,7 +241,7 @@ def infer_collection_metadata(collection: str, collection_meta: dict) -> dict:
         for artifact_name in artifacts:
             version = collection_meta["artifacts"][group_name][artifact_name]["latest_version"]
 
-            artifact = Artifact(collection, group_name, artifact_name, version)
+            artifact = get_artifact(collection, group_name, artifact_name, version)
             metadata = artifact.metadata
 
             # Check if artifact contains multiple (sub-)processes
@@ -150,9 +270,38 @@ def infer_collection_metadata(collection: str, collection_meta: dict) -> dict:
 
             collection_meta["artifacts"][group_name][artifact_name]["datatype"] = get_data_type(metadata)
 
+    collection_meta["index"] = build_collection_index(collection_meta)
     return collection_meta
 
 
+def build_collection_index(collection_meta: dict) -> dict:
+    """Builds inverted index from process names and subjects to related artifacts of collection.
+
+    Parameters
+    ----------
+    collection_meta : dict
+        Metadata of collection
+
+    Returns
+    -------
+    dict
+        Index holding lists of (group, artifact) pairs per process name (key "names")
+        and per process subject (key "subjects")
+    """
+    index = {"names": {}, "subjects": {}}
+    for group_name, artifacts in collection_meta["artifacts"].items():
+        for artifact_name, artifact_info in artifacts.items():
+            for key in ("names", "subjects"):
+                processes = artifact_info.get(key, [])
+                # Older collection metadata may hold a single process name as string
+                processes = [processes] if isinstance(processes, str) else processes
+                for process in processes:
+                    artifact_refs = index[key].setdefault(process, [])
+                    if [group_name, artifact_name] not in artifact_refs:
+                        artifact_refs.append([group_name, artifact_name])
+    return index
+
+
 def get_data_type(metadata: Union[str, pathlib.Path, dict]):
     metadata_dict: dict = core.get_metadata(metadata)
     for field in metadata_dict["resources"][0]["schema"]["fields"]:
@@ -192,6 +341,56 @@ def get_collection_meta(collection: str) -> dict:
     return metadata
 
 
+def _get_cached_collection_meta(collection: str) -> dict:
+    """Returns collection meta from in-process cache.
+
+    Collection meta is (re-)read, if collection.json has not been read before or
+    if modification time or size of collection.json changed since last read.
+    Returned metadata is shared between callers and must not be changed.
+
+    Parameters
+    ----------
+    collection : str
+        Name of collection to get metadata from
+
+    Returns
+    -------
+    dict
+        Metadata for given collection
+    """
+    collection_meta_file = pathlib.Path(settings.COLLECTIONS_DIR) / collection / settings.COLLECTION_JSON
+    if not collection_meta_file.exists():
+        # Let `get_collection_meta` raise the related error
+        return get_collection_meta(collection)
+    stat = collection_meta_file.stat()
+    file_stats = (stat.st_mtime_ns, stat.st_size)
+    cached = _COLLECTION_META_CACHE.get(collection_meta_file)
+    if cached is not None and cached[0] == file_stats:
+        _COLLECTION_META_CACHE_STATS["hits"] += 1
+        return cached[1]
+    _COLLECTION_META_CACHE_STATS["misses"] += 1
+    metadata = get_collection_meta(collection)
+    if "index" not in metadata:
+        # Collections downloaded before process index was introduced
+        metadata["index"] = build_collection_index(metadata)
+    _COLLECTION_META_CACHE[collection_meta_file] = (file_stats, metadata)
+    return metadata
+
+
+def get_collection_meta_cache_info() -> core.CacheInfo:
+    """Returns hits, misses and current size of collection meta cache."""
+    return core.CacheInfo(
+        _COLLECTION_META_CACHE_STATS["hits"], _COLLECTION_META_CACHE_STATS["misses"], len(_COLLECTION_META_CACHE)
+    )
+
+
+def clear_collection_meta_cache():
+    """Clears collection meta cache and resets its statistics."""
+    _COLLECTION_META_CACHE.clear()
+    _COLLECTION_META_CACHE_STATS["hits"] = 0
+    _COLLECTION_META_CACHE_STATS["misses"] = 0
+
+
 def get_artifacts_from_collection(
     collection: str, process: Optional[str] = None, use_annotation: Optional[bool] = None
 ) -> list[Artifact]:
@@ -212,25 +411,28 @@ def get_artifacts_from_collection(
         List of artifacts in collection (belonging to given process, if set)
     """
     use_annotation = settings.USE_ANNOTATIONS if use_annotation is None else use_annotation
-    collection_meta = get_collection_meta(collection)
+    collection_meta = _get_cached_collection_meta(collection)
+    if process:
+        artifact_refs = collection_meta["index"]["subjects" if use_annotation else "names"].get(process, [])
+    else:
+        artifact_refs = [
+            (group, artifact) for group, artifacts in collection_meta["artifacts"].items() for artifact in artifacts
+        ]
     artifacts = []
-    for group in collection_meta["artifacts"]:
-        for artifact, artifact_info in collection_meta["artifacts"][group].items():
-            process_names = artifact_info["subjects"] if use_annotation else artifact_info["names"]
-            if process and process not in process_names:
-                continue
-            filename = artifact
-            artifacts.append(
-                Artifact(
-                    collection,
-                    group,
-                    artifact,
-                    artifact_info["latest_version"],
-                    filename,
-                    datatype=DataType(artifact_info["datatype"]),
-                    multiple_types=artifact_info["multiple_types"],
-                ),
-            )
+    for group, artifact in artifact_refs:
+        artifact_info = collection_meta["artifacts"][group][artifact]
+        filename = artifact
+        artifacts.append(
+            get_artifact(
+                collection,
+                group,
+                artifact,
+                artifact_info["latest_version"],
+                filename,
+                datatype=DataType(artifact_info["datatype"]),
+                multiple_types=artifact_info["multiple_types"],
+            ),
+        )
     return artifacts
 
 
@@ -254,9 +456,9 @@ def get_artifact_from_collection(collection: str, group: str, artifact: str, ver
     Artifact
         related artifact
     """
-    collection_meta = get_collection_meta(collection)
+    collection_meta = _get_cached_collection_meta(collection)
     artifact_info = collection_meta["artifacts"][group][artifact]
-    return Artifact(
+    return get_artifact(
         collection,
         group,
         artifact,
@@ -281,9 +483,5 @@ def get_processes_from_collection(collection: str) -> set[str]:
     list[str]
         List of processes
     """
-    collection_meta = get_collection_meta(collection)
-    processes = set()
-    for artifacts in collection_meta["artifacts"].values():
-        for artifact in artifacts.values():
-            processes |= set(artifact["names"])
-    return processes
+    collection_meta = _get_cached_collection_meta(collection)
+    return set(collection_meta["index"]["names"])
@@ -1,6 +1,7 @@
 import datetime
 import json
 import pathlib
+from collections import namedtuple
 from typing import Union
 
 SCALAR_COLUMNS = {
@@ -25,6 +26,8 @@ TIMESERIES_COLUMNS = {
     "timeindex_resolution": str,
 }
 
+CacheInfo = namedtuple("CacheInfo", ("hits", "misses", "currsize"))
+
 OEP_TO_FRICTIONLESS_CONVERSION = {
     "int": "integer",
     "bigint": "integer",
@@ -198,6 +198,8 @@ def download_collection(collection_url: str, force_download=False):
     artifacts = get_artifacts_from_collection(collection_url)
     artifact_versions = {artifact: get_latest_version_of_artifact(artifact) for artifact in artifacts}
     __download_artifacts(artifact_versions, collection_dir, collection_meta, force_download)
+    # Downloaded files may replace files of already interned artifacts
+    collection.clear_artifact_cache()
     collection_meta = collection.infer_collection_metadata(collection_name, collection_meta)
 
     with open(collection_dir / settings.COLLECTION_JSON, "w", encoding="utf-8") as collection_json_file:
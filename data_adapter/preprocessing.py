@@ -1,21 +1,23 @@
 """Module to preprocess process data"""
+import asyncio
+import concurrent.futures
+import itertools
 import logging
 import math
 import pathlib
+import pickle
+import threading
 import warnings
-from collections import ChainMap, namedtuple
+from collections import ChainMap, Counter, OrderedDict, namedtuple
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from data_adapter import collection, core, settings
 from data_adapter.structure import Structure, StructureError
-from data_adapter.unit_conversion import (
-    IncompatibleUnitsError,
-    UnitConversionError,
-    get_conversion_factor,
-)
+from data_adapter.unit_conversion import get_target_conversion
 
 SCALAR_MERGE_GROUPS = ["region", "year"]
 TIMESERIES_MERGE_GROUPS = [
@@ -27,6 +29,20 @@ TIMESERIES_MERGE_GROUPS = [
 
 ForeignKey = namedtuple("ForeignKey", ("process", "parameter"))
 
+# Default number of concurrent reads/builds in async loading of processes
+ASYNC_CONCURRENCY = 8
+# Settings which are passed on to worker processes
+WORKER_SETTINGS = ("COLLECTIONS_DIR", "STRUCTURES_DIR", "USE_ANNOTATIONS", "CSV_ENGINE", "USE_ARTIFACT_CACHE")
+# Number of chunks per worker, processes are distributed to workers in chunks
+WORKER_CHUNKS = 4
+
+# Formats of process timeseries: "wide" (timeindex x (name, region) columns) or "long" (one row per value)
+TIMESERIES_FORMATS = ("wide", "long")
+LONG_TIMESERIES_COLUMNS = ["timestamp", "name", "region", "value"]
+
+# Python types of numeric values per numpy kind (bool must be checked before int)
+NUMERIC_TYPES = {"b": bool, "i": int, "f": float}
+
 
 @dataclass
 class Process:
@@ -46,7 +62,12 @@ class PreprocessingError(Exception):
 
 class Adapter:
     def __init__(
-        self, collection_name: str, structure: Optional[Structure] = None, units: Optional[list[str]] = None
+        self,
+        collection_name: str,
+        structure: Optional[Structure] = None,
+        units: Optional[list[str]] = None,
+        foreign_key_cache_size: Optional[int] = None,
+        timeseries_format: str = "wide",
     ) -> None:
         """The adapter is used to handle collection, structure and links centralized.
 
@@ -58,10 +79,39 @@ class Adapter:
             holding processes and parameters from Excel-file
         units : list[str]
             try to convert data with units in metadata into given units
+        foreign_key_cache_size : Optional[int]
+            Maximum number of foreign parameters to keep in cache (least recently used are dropped first);
+            None means unbounded, 0 disables cache
+        timeseries_format : str
+            Format of process timeseries, either "wide" (timeindex as index, (name, region) as columns)
+            or "long" (columns timestamp, name, region and value; name and region are categorical).
+            Long format only holds values present in data, thus, sparse timeseries are not filled up with NaNs.
         """
+        if timeseries_format not in TIMESERIES_FORMATS:
+            raise ValueError(f"Unknown {timeseries_format=}, must be one of {TIMESERIES_FORMATS}.")
         self.collection_name = collection_name
         self.structure = structure
         self.units = [] if units is None else units
+        self.foreign_key_cache_size = foreign_key_cache_size
+        self.timeseries_format = timeseries_format
+        self.__init_foreign_key_cache()
+
+    def __init_foreign_key_cache(self):
+        self.__foreign_key_cache: OrderedDict[tuple[str, str], Optional[tuple]] = OrderedDict()
+        self.__foreign_key_cache_hits = 0
+        self.__foreign_key_cache_misses = 0
+        self.__foreign_key_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Lock cannot be pickled, thus, foreign key cache (and its lock) is dropped and set up again on unpickling."""
+        state = self.__dict__.copy()
+        for attribute in ("cache", "cache_hits", "cache_misses", "lock"):
+            del state[f"_Adapter__foreign_key_{attribute}"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.__init_foreign_key_cache()
 
     def get_process(self, process: str) -> Process:
         """Loads data for given process from collection.
@@ -87,39 +137,361 @@ class Adapter:
         StructureError
             if additional parameters of process are related to multiple subjects
         """
+        self.__check_collection_folder()
+        return self.__get_process(process, self.__get_artifacts(process))
+
+    def get_processes(self, processes: Iterable[str], workers: Optional[int] = None) -> dict[str, Process]:
+        """Loads data for multiple processes from collection.
+
+        Artifacts needed by given processes are planned first and each artifact is read only once.
+        Artifacts holding multiple subprocesses are split by type in a single step.
+        Results are the same as calling `get_process` for each process.
+
+        If workers are given, processes are loaded in a pool of worker processes.
+        Processes sharing artifacts are loaded by the same worker.
+
+        Parameters
+        ----------
+        processes : Iterable[str]
+            Names of processes (from subject or metadata name, depends on USE_ANNOTATIONS)
+        workers : Optional[int]
+            Number of worker processes; processes are loaded in current process if not given (or 1)
+
+        Returns
+        -------
+        dict[str, Process]
+            Processes by name, in order of given processes
+
+        Raises
+        ------
+        FileNotFoundError
+            if collection is not present in collection folder
+        KeyError
+            if any process cannot be found in collection
+        StructureError
+            if additional parameters of process are related to multiple subjects
+        PreprocessingError
+            if loading of a process fails in a worker (original error is attached as cause)
+        """
+        plan = self.__get_plan(processes)
+        if workers is not None and workers > 1 and len(plan) > 1:
+            return self.__get_processes_in_pool(plan, workers)
+        frames = _ArtifactFrames()
+        return {process: self.__get_process(process, artifacts, frames) for process, artifacts in plan.items()}
+
+    def __get_processes_in_pool(self, plan: dict[str, list[collection.Artifact]], workers: int) -> dict[str, Process]:
+        """Loads processes in chunks using a pool of worker processes.
+
+        Only collection name, process names and units are sent to workers;
+        structure data is added to processes afterwards.
+        """
+        chunks = self.__get_chunks(plan, min(len(plan), workers * WORKER_CHUNKS))
+        results = {}
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)), initializer=_init_worker, initargs=(_get_worker_settings(),)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _load_processes,
+                    self.collection_name,
+                    chunk,
+                    self.units,
+                    self.foreign_key_cache_size,
+                    self.timeseries_format,
+                )
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    results.update(future.result())
+                except Exception as error:
+                    results.update({process: error for process in chunk if process not in results})
+
+        processes = {}
+        for process in plan:
+            result = results[process]
+            if isinstance(result, Exception):
+                raise PreprocessingError(
+                    f"Could not load {process=} from collection '{self.collection_name}': {result!r}"
+                ) from result
+            for field_name, value in self.__get_structure_fields(process).items():
+                setattr(result, field_name, value)
+            processes[process] = result
+        return processes
+
+    @staticmethod
+    def __get_chunks(plan: dict[str, list[collection.Artifact]], number: int) -> list[list[str]]:
+        """Splits processes into (at most) given number of chunks of similar size.
+
+        Processes sharing artifacts (directly or via other processes) form a group, which is never split;
+        thus, chunks are larger than others, if a group holds more processes than average chunk size.
+        """
+        ordered_processes = Adapter.__sort_by_artifacts(plan)
+        positions = {process: position for position, process in enumerate(ordered_processes)}
+        groups: dict[int, list[str]] = {}
+        group_of_artifact: dict[collection.Artifact, int] = {}
+        for position, process in enumerate(ordered_processes):
+            merged = {group_of_artifact[artifact] for artifact in plan[process] if artifact in group_of_artifact}
+            group = [member for group_id in merged for member in groups.pop(group_id)] + [process]
+            for member in group:
+                for artifact in plan[member]:
+                    group_of_artifact[artifact] = position
+            groups[position] = sorted(group, key=positions.get)
+
+        chunk_size = math.ceil(len(ordered_processes) / number)
+        chunks = [[]]
+        for group in sorted(groups.values(), key=lambda members: positions[members[0]]):
+            if chunks[-1] and len(chunks[-1]) + len(group) > chunk_size:
+                chunks.append([])
+            chunks[-1].extend(group)
+        return chunks
+
+    @staticmethod
+    def __sort_by_artifacts(plan: dict[str, list[collection.Artifact]]) -> list[str]:
+        """Sorts processes by their artifacts, thus, processes sharing artifacts follow each other."""
+        return sorted(
+            plan, key=lambda process: [(a.group, a.artifact, a.version, a.filename or "") for a in plan[process]]
+        )
+
+    def iter_processes(
+        self, processes: Optional[Iterable[str]] = None, prefetch: bool = False
+    ) -> Iterator[tuple[str, Process]]:
+        """Yields processes one by one, keeping only artifact data which is still needed in memory.
+
+        Foreign key targets of processes are resolved while planning (by reading foreign key columns only).
+        Processes are ordered by their artifacts (including foreign key targets), thus, processes sharing
+        an artifact follow each other and artifact data is released as soon as the last process using it
+        (or referencing it via foreign key) has been built. Foreign key targets are read only once,
+        independent of foreign key cache size.
+
+        Parameters
+        ----------
+        processes : Optional[Iterable[str]]
+            Names of processes to load; defaults to all processes of collection
+        prefetch : bool
+            If set, artifacts of next process are read in a background thread while current process is built
+
+        Yields
+        ------
+        tuple[str, Process]
+            Name of process and process
+
+        Raises
+        ------
+        FileNotFoundError
+            if collection is not present in collection folder
+        KeyError
+            if any process cannot be found in collection
+        StructureError
+            if additional parameters of process are related to multiple subjects
+        """
+        self.__check_collection_folder()
+        if processes is None:
+            processes = sorted(collection.get_processes_from_collection(self.collection_name))
+        plan = {process: self.__get_artifacts(process) for process in processes}
+        foreign_key_columns = {}
+        needed = {
+            process: list(
+                dict.fromkeys(artifacts + self.__get_foreign_artifacts(process, artifacts, foreign_key_columns))
+            )
+            for process, artifacts in plan.items()
+        }
+        ordered_processes = self.__sort_by_artifacts(needed)
+        # Number of pending processes per artifact
+        pending = Counter(itertools.chain.from_iterable(needed.values()))
+        frames = _ArtifactFrames()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            for position, process in enumerate(ordered_processes):
+                if executor is not None and position + 1 < len(ordered_processes):
+                    # Errors are raised when next process reads artifact again
+                    for artifact in needed[ordered_processes[position + 1]]:
+                        executor.submit(frames.load, artifact)
+                result = self.__get_process(process, plan[process], frames)
+                pending.subtract(needed[process])
+                # Release artifact data (including foreign key targets) which is not needed anymore
+                frames.release(keep={artifact for artifact, count in pending.items() if count > 0})
+                yield process, result
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def __get_foreign_artifacts(
+        self,
+        process: str,
+        artifacts: list[collection.Artifact],
+        foreign_key_columns: dict[collection.Artifact, pd.DataFrame],
+    ) -> list[collection.Artifact]:
+        """Returns artifacts of foreign key targets of process.
+
+        Only FK candidate columns of scalar artifacts are read; read columns are stored in given dict,
+        thus, artifacts shared by multiple processes are read only once while planning.
+        Targets which cannot be found (or are not unique) are skipped; errors are raised when process is built.
+        """
+        foreign_artifacts = []
+        for artifact in artifacts:
+            if artifact.datatype != collection.DataType.Scalar:
+                continue
+            if artifact not in foreign_key_columns:
+                string_columns = [
+                    column for column in self._get_text_columns(artifact.metadata) if column not in core.SCALAR_COLUMNS
+                ]
+                if artifact.multiple_types and "type" not in string_columns:
+                    string_columns.append("type")
+                foreign_key_columns[artifact] = artifact.read(columns=string_columns) if string_columns else None
+            df = foreign_key_columns[artifact]
+            if df is None:
+                continue
+            if artifact.multiple_types:
+                df = df.assign(type=df["type"].fillna(artifact.metadata["name"]))
+                df = self.__filter_subprocess(df, process)
+            for foreign_key in self._get_foreign_keys(process, df, artifact.metadata).values():
+                targets = collection.get_artifacts_from_collection(
+                    self.collection_name, foreign_key.process, use_annotation=False
+                )
+                if len(targets) == 1:
+                    foreign_artifacts.append(targets[0])
+        return foreign_artifacts
+
+    def _load_processes(self, processes: Iterable[str]) -> dict[str, Union[Process, Exception]]:
+        """Loads processes sharing artifact data, returning errors instead of raising them (used by workers)."""
+        frames = _ArtifactFrames()
+        results = {}
+        for process in processes:
+            try:
+                results[process] = self.__get_process(process, self.__get_artifacts(process), frames)
+            except Exception as error:
+                try:
+                    pickle.dumps(error)
+                except Exception:
+                    error = PreprocessingError(repr(error))
+                results[process] = error
+        return results
+
+    async def aget_process(self, process: str, executor: Optional[concurrent.futures.Executor] = None) -> Process:
+        """Loads data for given process from collection without blocking the event loop.
+
+        See `aget_processes` for details.
+
+        Parameters
+        ----------
+        process : str
+            Name of process (from subject or metadata name, depends on USE_ANNOTATIONS)
+        executor : Optional[concurrent.futures.Executor]
+            Thread-based executor to run reading and processing in; defaults to executor of event loop
+
+        Returns
+        -------
+        Process
+            Scalars and timeseries for given process
+        """
+        processes = await self.aget_processes([process], executor=executor)
+        return processes[process]
+
+    async def aget_processes(
+        self,
+        processes: Iterable[str],
+        concurrency: int = ASYNC_CONCURRENCY,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> dict[str, Process]:
+        """Loads data for multiple processes from collection without blocking the event loop.
+
+        Artifact files are read concurrently and processes are built in an executor,
+        thus, reading artifacts of one process overlaps with processing of another.
+        Each artifact is read only once, as in `get_processes`.
+
+        Parameters
+        ----------
+        processes : Iterable[str]
+            Names of processes (from subject or metadata name, depends on USE_ANNOTATIONS)
+        concurrency : int
+            Maximum number of artifact reads and process builds running at the same time
+        executor : Optional[concurrent.futures.Executor]
+            Thread-based executor to run reading and processing in; defaults to executor of event loop
+
+        Returns
+        -------
+        dict[str, Process]
+            Processes by name, in order of given processes
+
+        Raises
+        ------
+        FileNotFoundError
+            if collection is not present in collection folder
+        KeyError
+            if any process cannot be found in collection
+        StructureError
+            if additional parameters of process are related to multiple subjects
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(func, *args):
+            async with semaphore:
+                return await loop.run_in_executor(executor, func, *args)
+
+        # Planning looks up collection metadata (file access), thus, it is done in executor, too
+        plan = await loop.run_in_executor(executor, self.__get_plan, list(processes))
+        frames = _ArtifactFrames()
+
+        async def load(process: str, artifacts: list[collection.Artifact]) -> Process:
+            await asyncio.gather(*(run(frames.load, artifact) for artifact in artifacts))
+            return await run(self.__get_process, process, artifacts, frames)
+
+        results = await asyncio.gather(*(load(process, artifacts) for process, artifacts in plan.items()))
+        return dict(zip(plan, results))
+
+    def __check_collection_folder(self):
         collection_folder = pathlib.Path(settings.COLLECTIONS_DIR) / self.collection_name
         if not collection_folder.exists():
             raise FileNotFoundError(
                 f"Could not find {self.collection_name=} in collection folder '{settings.COLLECTIONS_DIR}'.",
             )
+
+    def __get_plan(self, processes: Iterable[str]) -> dict[str, list[collection.Artifact]]:
+        """Returns artifacts per process, checking collection folder first."""
+        self.__check_collection_folder()
+        return {process: self.__get_artifacts(process) for process in processes}
+
+    def __get_artifacts(self, process: str) -> list[collection.Artifact]:
         artifacts = collection.get_artifacts_from_collection(self.collection_name, process)
         if not artifacts:
             raise KeyError(f"Could not find {process=} in collection '{self.collection_name}'.")
+        return artifacts
 
+    def __get_process(
+        self,
+        process: str,
+        artifacts: list[collection.Artifact],
+        frames: Optional["_ArtifactFrames"] = None,
+    ) -> Process:
+        """Builds process from given artifacts.
+
+        If frames are given, artifact data is taken from there instead of reading it from disk.
+        """
         # Get dataframes from processes by subject
         scalar_dfs = []
         timeseries_df = []
         units = {}
         for artifact in artifacts:
-            df, artifact_units = self.__get_df_from_artifact(artifact, process)
+            df, artifact_units = self.__get_df_from_artifact(artifact, process, frames=frames)
             units = {**units, **artifact_units}
             if artifact.datatype == collection.DataType.Scalar:
                 # Handle foreign keys (only possible in scalar data)
-                foreign_keys = self._get_foreign_keys(process, df)
+                foreign_keys = self._get_foreign_keys(process, df, artifact.metadata)
+                # Parameters of same foreign process are read at once
+                foreign_parameters = {}
+                for foreign_key in foreign_keys.values():
+                    foreign_parameters.setdefault(foreign_key.process, []).append(foreign_key.parameter)
                 for fk_column, foreign_key in foreign_keys.items():
-                    artifacts = collection.get_artifacts_from_collection(
-                        self.collection_name, foreign_key.process, use_annotation=False
+                    foreign = self.__get_foreign_df(
+                        process, foreign_key, foreign_parameters[foreign_key.process], frames=frames
                     )
-                    if not artifacts:
+                    if foreign is None:
                         continue  # no candidate
-                    if len(artifacts) > 1:
-                        raise StructureError(
-                            f"Foreign key for process '{process}' points to subject '{foreign_key.process}' "
-                            "which is not unique.",
-                        )
-                    foreign_df = self.__get_df_from_artifact(artifacts[0], foreign_key.process, foreign_key.parameter)[0]
+                    foreign_df, foreign_datatype = foreign
                     foreign_df = foreign_df.rename({foreign_key.parameter: fk_column}, axis=1)
-                    if artifacts[0].datatype == collection.DataType.Scalar:
+                    if foreign_datatype == collection.DataType.Scalar:
                         scalar_dfs.append(foreign_df)
                     else:
                         timeseries_df.append(foreign_df)
@@ -135,12 +507,118 @@ class Adapter:
                 self.__merge_parameters(*timeseries_df, datatype=collection.DataType.Timeseries)
             ),
             units=units,
-            inputs=self.structure.processes[process]["inputs"] if self.structure else None,
-            outputs=self.structure.processes[process]["outputs"] if self.structure else None,
-            parameters=self.structure.parameters[process]
+            **self.__get_structure_fields(process),
+        )
+
+    def __get_structure_fields(self, process: str) -> dict:
+        """Returns inputs, outputs and parameters of process from structure."""
+        return {
+            "inputs": self.structure.processes[process]["inputs"] if self.structure else None,
+            "outputs": self.structure.processes[process]["outputs"] if self.structure else None,
+            "parameters": self.structure.parameters[process]
             if self.structure and "process" in self.structure.parameters
             else None,
+        }
+
+    def __get_foreign_df(
+        self,
+        process: str,
+        foreign_key: ForeignKey,
+        parameters: Iterable[str],
+        frames: Optional["_ArtifactFrames"] = None,
+    ) -> Optional[tuple[pd.DataFrame, collection.DataType]]:
+        """Returns data of foreign key target from cache or reads it from collection.
+
+        On a cache miss, all given parameters of the foreign process which are not cached yet
+        are read from target artifact at once and cached separately.
+
+        Parameters
+        ----------
+        process: str
+            Process holding the foreign key (used in error message)
+        foreign_key: ForeignKey
+            Foreign process and parameter to get data for
+        parameters: Iterable[str]
+            All parameters of foreign process referenced by process
+        frames: Optional[_ArtifactFrames]
+            Artifact data already read; if not given, artifact is read from disk
+
+        Returns
+        -------
+        Optional[tuple[pd.DataFrame, collection.DataType]]
+            Data of foreign parameter (unit-converted and region-exploded) and datatype of foreign artifact,
+            or None if foreign process is not found in collection
+
+        Raises
+        ------
+        StructureError
+            if foreign process is not unique in collection
+        """
+        key = (foreign_key.process, foreign_key.parameter)
+        with self.__foreign_key_lock:
+            if key in self.__foreign_key_cache:
+                self.__foreign_key_cache_hits += 1
+                self.__foreign_key_cache.move_to_end(key)
+                return self.__foreign_key_cache[key]
+            self.__foreign_key_cache_misses += 1
+
+        artifacts = collection.get_artifacts_from_collection(
+            self.collection_name, foreign_key.process, use_annotation=False
         )
+        if not artifacts:
+            self.__add_to_foreign_key_cache(key, None)
+            return None
+        if len(artifacts) > 1:
+            raise StructureError(
+                f"Foreign key for process '{process}' points to subject '{foreign_key.process}' which is not unique.",
+            )
+        artifact = artifacts[0]
+        with self.__foreign_key_lock:
+            missing_parameters = [
+                parameter
+                for parameter in dict.fromkeys(parameters)
+                if parameter == foreign_key.parameter
+                or (foreign_key.process, parameter) not in self.__foreign_key_cache
+            ]
+        df = self.__get_df_from_artifact(artifact, foreign_key.process, *missing_parameters, frames=frames)[0]
+        default_columns = self.__get_default_columns(artifact.datatype)
+        foreign = None
+        for parameter in missing_parameters:
+            parameter_df = df[[column for column in df.columns if column in default_columns or column == parameter]]
+            self.__add_to_foreign_key_cache((foreign_key.process, parameter), (parameter_df, artifact.datatype))
+            if parameter == foreign_key.parameter:
+                foreign = (parameter_df, artifact.datatype)
+        return foreign
+
+    def __add_to_foreign_key_cache(self, key: tuple[str, str], value: Optional[tuple]):
+        if self.foreign_key_cache_size == 0:
+            return
+        with self.__foreign_key_lock:
+            self.__foreign_key_cache[key] = value
+            self.__foreign_key_cache.move_to_end(key)
+            if self.foreign_key_cache_size is not None:
+                while len(self.__foreign_key_cache) > self.foreign_key_cache_size:
+                    self.__foreign_key_cache.popitem(last=False)
+
+    def get_foreign_key_cache_info(self) -> core.CacheInfo:
+        """Returns statistics of foreign key cache.
+
+        Returns
+        -------
+        core.CacheInfo
+            Hits, misses and number of cached foreign parameters
+        """
+        with self.__foreign_key_lock:
+            return core.CacheInfo(
+                self.__foreign_key_cache_hits, self.__foreign_key_cache_misses, len(self.__foreign_key_cache)
+            )
+
+    def clear_foreign_key_cache(self):
+        """Clears cached foreign key data and resets statistics."""
+        with self.__foreign_key_lock:
+            self.__foreign_key_cache.clear()
+            self.__foreign_key_cache_hits = 0
+            self.__foreign_key_cache_misses = 0
 
     def get_structure(self) -> dict:
         """Return energy structure for structure name of adapter.
@@ -182,10 +660,13 @@ class Adapter:
             )
         return self.structure.processes
 
-    def __get_df_from_artifact(self, artifact: collection.Artifact, process: str, *parameters: str) -> (
-            pd.DataFrame,
-            dict
-    ):
+    def __get_df_from_artifact(
+        self,
+        artifact: collection.Artifact,
+        process: str,
+        *parameters: str,
+        frames: Optional["_ArtifactFrames"] = None,
+    ) -> (pd.DataFrame, dict):
         """Returns DataFrame from given artifact.
 
         If parameters are given, artifact columns are filtered for given parameters
@@ -199,12 +680,27 @@ class Adapter:
             Process to filter (needed in case of multiple subprocesses)
         parameters: tuple[str]
             Parameters to filter DataFrame
+        frames: Optional[_ArtifactFrames]
+            Artifact data already read; if not given, artifact is read from disk
 
         Returns
         -------
         pd.DataFrame
         """
-        df = artifact.data
+        columns = None
+        if len(parameters) > 0:
+            # Only read requested parameters and default columns from datatype
+            columns = self.__get_default_columns(artifact.datatype).union(parameters)
+            if artifact.multiple_types:
+                columns.add("type")
+        if frames is not None:
+            df = frames.get(artifact, process, columns)
+        else:
+            filters = None
+            if artifact.multiple_types:
+                # Only read rows of subprocess; empty types belong to table process
+                filters = {"type": {process, None} if process == artifact.metadata["name"] else {process}}
+            df = artifact.read(columns=columns, filters=filters)
 
         if artifact.multiple_types:
             # Fill empty types with table process name
@@ -238,10 +734,6 @@ class Adapter:
         pd.DataFrame
             with converted units, if unit conversion is possible
         """
-
-        def convert_series(series: list[float], factor: float) -> list[float]:
-            return [item * factor for item in series]
-
         df_units = {}
         if df.empty:
             return df
@@ -254,20 +746,54 @@ class Adapter:
                 continue
             df_units[field["name"]] = field["unit"]
             conversion_factor = None
-            for unit in self.units:
-                try:
-                    conversion_factor = get_conversion_factor(field["unit"], unit)
-                    df_units[field["name"]] = unit
-                except (UnitConversionError, IncompatibleUnitsError):
-                    continue
-                break
+            target_conversion = get_target_conversion(field["unit"], self.units)
+            if target_conversion is not None:
+                df_units[field["name"]], conversion_factor = target_conversion
             if conversion_factor:
                 if "array" in field["type"]:
-                    df[field["name"]] = df[field["name"]].apply(convert_series, factor=conversion_factor)
+                    df[field["name"]] = self.__convert_arrays(df[field["name"]], conversion_factor)
                 else:
                     df[field["name"]] = df[field["name"]] * conversion_factor
         return df, df_units
 
+    @staticmethod
+    def __convert_arrays(series: pd.Series, factor: float) -> pd.Series:
+        """Multiplies arrays in series with conversion factor.
+
+        Arrays are multiplied in one numpy operation; arrays of same length are stacked into a 2D block,
+        otherwise arrays are concatenated and split again afterwards.
+        Cells holding no array (missing values) are kept as is.
+
+        Parameters
+        ----------
+        series: pd.Series
+            Series holding arrays (lists) per cell
+        factor: float
+            Conversion factor
+
+        Returns
+        -------
+        pd.Series
+            Series holding converted arrays as lists
+        """
+        cells = series.tolist()
+        positions = [position for position, cell in enumerate(cells) if isinstance(cell, list)]
+        if not positions:
+            return series
+        arrays = [cells[position] for position in positions]
+        if not isinstance(factor, float):
+            # Integer factors keep integer items, as in plain python multiplication
+            converted = [[item * factor for item in array] for array in arrays]
+        elif len({len(array) for array in arrays}) == 1:
+            converted = (np.array(arrays, dtype=float) * factor).tolist()
+        else:
+            lengths = [len(array) for array in arrays]
+            flat = np.array(list(itertools.chain.from_iterable(arrays)), dtype=float) * factor
+            converted = [part.tolist() for part in np.split(flat, np.cumsum(lengths)[:-1])]
+        for position, array in zip(positions, converted):
+            cells[position] = array
+        return pd.Series(cells, index=series.index, name=series.name, dtype=object)
+
     def __unpack_bandwidths(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Takes Dataframe right and unpacks all found bandwidths.
@@ -288,17 +814,23 @@ class Adapter:
         if "bandwidth_type" not in df.columns:
             return df
 
-        if "bandwidth_type" in df.columns:
-            # Iterate rows of dataframe
-            for index, row in df.iterrows():
-                bandwidth_keys = row["bandwidth_type"].keys()
-                for col in df.columns:
-                    if col in bandwidth_keys and isinstance(row[col], list):
-                        # Replace Values
-                        if row[col]:
-                            df.at[index, col] = row[col][0]
-                        else:
-                            df.at[index, col] = None
+        # Bandwidth keys per row; rows without bandwidth types are left untouched
+        bandwidth_keys = [keys.keys() if isinstance(keys, dict) else () for keys in df["bandwidth_type"]]
+        bandwidth_columns = set().union(*bandwidth_keys).intersection(df.columns)
+        for col in df.columns:
+            if col not in bandwidth_columns:
+                continue
+            values = df[col].tolist()
+            positions = [
+                position
+                for position, (value, keys) in enumerate(zip(values, bandwidth_keys))
+                if col in keys and isinstance(value, list)
+            ]
+            if positions:
+                # Replace bandwidths by their first value (or None if empty)
+                for position in positions:
+                    values[position] = values[position][0] if values[position] else None
+                df[col] = pd.Series(values, index=df.index, dtype=object)
         return df
 
     @staticmethod
@@ -329,14 +861,22 @@ class Adapter:
         pd.DataFrame
             Filtered data frame with remaining columns from parameter list
         """
-        columns = set(core.SCALAR_COLUMNS) if datatype is collection.DataType.Scalar else set(core.TIMESERIES_COLUMNS)
+        columns = Adapter.__get_default_columns(datatype)
         columns.update(set(parameters))
         drop_columns = set(df.columns).difference(columns)
         return df.drop(drop_columns, axis=1)
 
+    @staticmethod
+    def __get_default_columns(datatype: collection.DataType) -> set[str]:
+        return set(core.SCALAR_COLUMNS) if datatype is collection.DataType.Scalar else set(core.TIMESERIES_COLUMNS)
+
     def __merge_parameters(self, *df: pd.DataFrame, datatype: collection.DataType) -> pd.DataFrame:
         """Merges parameters.
 
+        Rows are grouped by region and year (scalars) or by region and timeindex (timeseries).
+        Per group, last non-null value of each column is taken; dict columns from datamodel are merged,
+        with first dict taking precedence. Columns are merged at once for all groups.
+
         Parameters
         ----------
         df: pd.DataFrame
@@ -348,56 +888,119 @@ class Adapter:
         -------
         pd.DataFrame
             Each region in the dataframe has its own row
+
+        Raises
+        ------
+        PreprocessingError
+            if different values are given for same column within a group or dict columns hold no dicts
         """
         if len(df) == 0:
             return pd.DataFrame(dtype=object)
         concatenated_dfs = pd.concat(df)
         concatenated_dfs["region"] = concatenated_dfs["region"].apply(lambda x: tuple(x) if isinstance(x, list) else x)
         groups = SCALAR_MERGE_GROUPS if datatype == collection.DataType.Scalar else TIMESERIES_MERGE_GROUPS
-        merged_regions = concatenated_dfs.groupby(groups).apply(self.__apply_parameter_merge, datatype=datatype)
-        if merged_regions.empty:
-            # This must be done, otherwise grouped columns appear in index and columns and cannot be reset afterwards
-            merged_regions = merged_regions.drop(SCALAR_MERGE_GROUPS, axis=1)
-        return merged_regions.reset_index()
-
-    def __apply_parameter_merge(self, data, datatype):
         datamodel_columns = core.SCALAR_COLUMNS if datatype == collection.DataType.Scalar else core.TIMESERIES_COLUMNS
-        groups = SCALAR_MERGE_GROUPS if datatype == collection.DataType.Scalar else TIMESERIES_MERGE_GROUPS
-
-        series = pd.Series(dtype=object)
-        for column in data.columns:
+        grouped = concatenated_dfs.groupby(groups)
+        if grouped.ngroups == 0:
+            # No rows with valid group values; grouped columns are moved to front, as in grouped result
+            return concatenated_dfs.iloc[:0].set_index(groups).reset_index()
+
+        # Group codes follow sorted group order; rows are sorted stable by group code
+        # Rows with missing group values (no group code) are dropped, as in groupby
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=int)
+        order = np.argsort(codes, kind="stable")
+        order = order[codes[order] >= 0]
+        codes = codes[order]
+        merged_columns = {}
+        errors = []
+        for column in concatenated_dfs.columns:
             if column in ["id", "version", *groups]:
                 continue  # Drop columns
-            try:
-                series[column] = self.__merge_column(column, data[column], datamodel_columns)
-            except ValueError:
-                region = data["region"].iloc[0]
+            values = concatenated_dfs[column].iloc[order]
+            if column in datamodel_columns and datamodel_columns[column] is dict:
+                merged, error = self.__merge_dict_column(column, values, codes, grouped.ngroups)
+            else:
+                merged, error = self.__merge_column(column, values, codes, grouped.ngroups)
+            merged_columns[column] = merged
+            if error is not None:
+                errors.append((error[0], len(errors), error[1]))
+        if errors:
+            # Raise error of first group (and first column within group)
+            code, _, error = min(errors, key=lambda item: item[:2])
+            if isinstance(error, ValueError):
+                region = grouped.size().index[code][0]
                 raise PreprocessingError(f"Merging of {region=} failed, due to duplicate value entries.")
-        return series
+            raise error
+
+        rows, kinds = zip(*(_build_row(row) for row in zip(*merged_columns.values()))) if merged_columns else ([], [])
+        if merged_columns and "O" not in kinds:
+            # Only numeric rows are stacked into a single numeric block
+            rows = np.array(rows, dtype=np.result_type(*(NUMERIC_TYPES[kind] for kind in kinds)))
+        merged_regions = pd.DataFrame(
+            rows if merged_columns else None, index=grouped.size().index, columns=list(merged_columns)
+        )
+        return merged_regions.reset_index()
 
     @staticmethod
-    def __merge_column(column, values, datamodel_columns):
-        if column in datamodel_columns and datamodel_columns[column] is dict:
-            dicts = []
-            for dict_value in values:
-                if dict_value is None or (isinstance(dict_value, float) and math.isnan(dict_value)):
-                    continue
-                if isinstance(dict_value, dict):
-                    dicts.append(dict_value)
-                    continue
-                raise PreprocessingError(f"Value in {column=} is not a dict/JSON.")
-            return dict(ChainMap(*dicts))
-        value = None
-        for v in values:
-            if v is None or (isinstance(v, (float, int)) and math.isnan(v)):
+    def __merge_dict_column(
+        column: str, values: pd.Series, codes: np.ndarray, ngroups: int
+    ) -> (list[dict], Optional[tuple[int, Exception]]):
+        """Merges dicts per group; first dict of a group takes precedence.
+
+        Returns merged dict per group and first error (group code and error), if any.
+        """
+        dicts = [[] for _ in range(ngroups)]
+        error = None
+        for code, dict_value in zip(codes, values.tolist()):
+            if dict_value is None or (isinstance(dict_value, float) and math.isnan(dict_value)):
+                continue
+            if isinstance(dict_value, dict):
+                dicts[code].append(dict_value)
                 continue
-            if v and value and v != value:
-                raise PreprocessingError(f"Multiple values defined for {column=}: ({v}, {value})")
-            value = v
-        return value
+            if error is None:
+                error = (code, PreprocessingError(f"Value in {column=} is not a dict/JSON."))
+        return [dict(ChainMap(*group_dicts)) for group_dicts in dicts], error
 
     @staticmethod
-    def __refactor_timeseries(timeseries_raw: pd.DataFrame) -> pd.DataFrame:
+    def __merge_column(
+        column: str, values: pd.Series, codes: np.ndarray, ngroups: int
+    ) -> (list, Optional[tuple[int, Exception]]):
+        """Takes last non-null value per group.
+
+        Differing consecutive non-null values within a group are not allowed, unless one of them is falsy.
+        Returns value per group and first error (group code and error), if any.
+        """
+        not_null = values.notna().to_numpy()
+        codes = codes[not_null]
+        values = values[not_null]
+        merged = [None] * ngroups
+        if len(codes) == 0:
+            return merged, None
+        items = values.tolist()
+        last = np.append(codes[1:] != codes[:-1], True)
+        for code, value in zip(codes[last], itertools.compress(items, last)):
+            merged[code] = value
+
+        # Check consecutive values within same group for conflicts
+        same_group = codes[1:] == codes[:-1]
+        if values.dtype.kind in "iufb":
+            array = values.to_numpy()
+            candidates = same_group & (array[1:] != 0) & (array[:-1] != 0) & (array[1:] != array[:-1])
+        else:
+            candidates = same_group
+        for position in np.flatnonzero(candidates):
+            value, v = items[position], items[position + 1]
+            try:
+                if v and value and v != value:
+                    return merged, (
+                        codes[position],
+                        PreprocessingError(f"Multiple values defined for {column=}: ({v}, {value})"),
+                    )
+            except ValueError as error:
+                return merged, (codes[position], error)
+        return merged, None
+
+    def __refactor_timeseries(self, timeseries_raw: pd.DataFrame) -> pd.DataFrame:
         """Takes timeseries in single line parameter-model format (start, end, freq,
         region, ts-array...) and turns into Tabular matching format with timeindex
         as timeseries timestamps, technology-region as header and columns
@@ -413,29 +1016,135 @@ class Adapter:
         -------
         pd.DataFrame:
             Tabular form of timeseries for multiple periods of similar
-            technologies and regions.
+            technologies and regions; in long format (see `timeseries_format` of adapter),
+            one row per timestamp, technology and region is returned instead.
         """
         if timeseries_raw.empty:
+            if self.timeseries_format == "long":
+                # Same dtypes as non-empty long timeseries
+                return pd.DataFrame(
+                    {
+                        "timestamp": pd.Series(dtype="datetime64[ns]"),
+                        "name": pd.Categorical([]),
+                        "region": pd.Categorical([]),
+                        "value": pd.Series(dtype="float64"),
+                    },
+                    columns=LONG_TIMESERIES_COLUMNS,
+                )
             return timeseries_raw
-        ts_columns = set(timeseries_raw.columns).difference(core.TIMESERIES_COLUMNS.keys())
-        timeseries: dict[tuple, pd.Series] = {}
-        for _, row in timeseries_raw.iterrows():
-            timeindex = pd.date_range(
-                start=row["timeindex_start"], end=row["timeindex_stop"], freq=pd.Timedelta(row["timeindex_resolution"])
+        ts_columns = [column for column in timeseries_raw.columns if column not in core.TIMESERIES_COLUMNS]
+
+        # Build timeindex only once per period
+        periods = list(
+            zip(
+                timeseries_raw["timeindex_start"],
+                timeseries_raw["timeindex_stop"],
+                timeseries_raw["timeindex_resolution"],
             )
-            for ts_column in ts_columns:
-                ts_index = (ts_column, row["region"])
-                ts_series = pd.Series(row[ts_column], index=timeindex, name=ts_index)
-                if ts_index in timeseries:
-                    timeseries[ts_index] = pd.concat([timeseries[ts_index], ts_series])
-                else:
-                    timeseries[ts_index] = ts_series
-        merged_timeseries = pd.concat(timeseries.values(), axis=1)
-        merged_timeseries.columns.names = ("name", "region")
+        )
+        timeindices = {
+            period: pd.date_range(start=period[0], end=period[1], freq=pd.Timedelta(period[2]))
+            for period in dict.fromkeys(periods)
+        }
+
+        # Collect periods and values per (column, region); periods are concatenated in order of rows
+        ts_periods: dict[tuple, list] = {}
+        ts_values: dict[tuple, list[np.ndarray]] = {}
+        for period, region, *values in zip(
+            periods, timeseries_raw["region"], *(timeseries_raw[ts_column] for ts_column in ts_columns)
+        ):
+            timeindex = timeindices[period]
+            for ts_column, value in zip(ts_columns, values):
+                ts_index = (ts_column, region)
+                ts_periods.setdefault(ts_index, []).append(period)
+                ts_values.setdefault(ts_index, []).append(self.__get_timeseries_values(value, timeindex))
+
+        ts_arrays = {ts_index: self.__concat_timeseries_values(arrays) for ts_index, arrays in ts_values.items()}
+        if self.timeseries_format == "long":
+            return self.__get_long_timeseries(timeindices, ts_periods, ts_arrays)
+        columns = pd.MultiIndex.from_tuples(list(ts_arrays), names=("name", "region"))
+        if len(set(map(tuple, ts_periods.values()))) > 1:
+            # Timeseries cover different periods and must be aligned by timeindex
+            timeseries = [
+                pd.Series(array, index=self.__concat_timeindices(timeindices, ts_periods[ts_index]), name=ts_index)
+                for ts_index, array in ts_arrays.items()
+            ]
+            merged_timeseries = pd.concat(timeseries, axis=1)
+            merged_timeseries.columns.names = ("name", "region")
+            return merged_timeseries
+
+        timeindex = self.__concat_timeindices(timeindices, next(iter(ts_periods.values())))
+        dtypes = {array.dtype for array in ts_arrays.values()}
+        if len(dtypes) == 1:
+            # Stack all timeseries into a single 2D block
+            block = np.empty((len(timeindex), len(ts_arrays)), dtype=dtypes.pop())
+            for position, array in enumerate(ts_arrays.values()):
+                block[:, position] = array
+            return pd.DataFrame(block, index=timeindex, columns=columns)
+        merged_timeseries = pd.DataFrame(dict(enumerate(ts_arrays.values())), index=timeindex)
+        merged_timeseries.columns = columns
         return merged_timeseries
 
+    def __get_long_timeseries(
+        self,
+        timeindices: dict[tuple, pd.DatetimeIndex],
+        ts_periods: dict[tuple, list],
+        ts_arrays: dict[tuple, np.ndarray],
+    ) -> pd.DataFrame:
+        """Stacks timeseries per (name, region) into long format, holding only timestamps present per timeseries."""
+        names = pd.Index(dict.fromkeys(name for name, _ in ts_arrays), tupleize_cols=False)
+        regions = pd.Index(dict.fromkeys(region for _, region in ts_arrays), tupleize_cols=False)
+        lengths = [len(array) for array in ts_arrays.values()]
+        timestamps = [self.__concat_timeindices(timeindices, ts_periods[ts_index]) for ts_index in ts_arrays]
+        return pd.DataFrame(
+            {
+                "timestamp": timestamps[0].append(timestamps[1:]) if len(timestamps) > 1 else timestamps[0],
+                "name": pd.Categorical.from_codes(
+                    np.repeat(names.get_indexer([name for name, _ in ts_arrays]), lengths), categories=names
+                ),
+                "region": pd.Categorical.from_codes(
+                    np.repeat(regions.get_indexer([region for _, region in ts_arrays]), lengths), categories=regions
+                ),
+                "value": self.__concat_timeseries_values(list(ts_arrays.values())),
+            }
+        )
+
+    @staticmethod
+    def __get_timeseries_values(value, timeindex: pd.DatetimeIndex) -> np.ndarray:
+        """Returns timeseries values of single row as array, in the same dtype as a series would hold."""
+        if isinstance(value, list):
+            array = np.asarray(value)
+            if array.dtype.kind in "biuf" and len(array) == len(timeindex):
+                return array
+        return pd.Series(value, index=timeindex).to_numpy()
+
+    @staticmethod
+    def __concat_timeseries_values(arrays: list[np.ndarray]) -> np.ndarray:
+        """Concatenates values of multiple periods, with common dtype as from concatenating series."""
+        if len(arrays) == 1:
+            return arrays[0]
+        kinds = {array.dtype.kind for array in arrays}
+        if len({array.dtype for array in arrays}) > 1 and not kinds.issubset({"i", "u", "f"}):
+            return np.concatenate([array.astype(object) for array in arrays])
+        return np.concatenate(arrays)
+
     @staticmethod
-    def _get_foreign_keys(process: str, df: pd.DataFrame) -> dict[str, ForeignKey]:
+    def __concat_timeindices(timeindices: dict[tuple, pd.DatetimeIndex], periods: list[tuple]) -> pd.DatetimeIndex:
+        timeindex = timeindices[periods[0]]
+        return timeindex.append([timeindices[period] for period in periods[1:]]) if len(periods) > 1 else timeindex
+
+    @staticmethod
+    def _get_text_columns(metadata: dict) -> list[str]:
+        """Returns names of text (non-array) fields from schema of artifact metadata; only these can hold FKs."""
+        return [
+            field["name"]
+            for field in metadata["resources"][0]["schema"]["fields"]
+            if "array" not in field["type"]
+            and core.OEP_TO_FRICTIONLESS_CONVERSION.get(field["type"], field["type"]) == "string"
+        ]
+
+    @staticmethod
+    def _get_foreign_keys(process: str, df: pd.DataFrame, metadata: Optional[dict] = None) -> dict[str, ForeignKey]:
         """
         Detect and check foreign keys in scalar data and return related columns and references
 
@@ -445,25 +1154,33 @@ class Adapter:
             Name of process
         df
             Process data in scalar format (only scalar data holds FKs)
+        metadata: Optional[dict]
+            Metadata of artifact; if given, only text fields from schema are checked for FKs.
+            Otherwise, string columns are detected by converting dtypes of data.
 
         Returns
         -------
         Dict of columns which hold foreign keys and related foreign key
         """
         # Column must contain string
-        converted_df = df.convert_dtypes()
-        string_columns = set(converted_df.dtypes[converted_df.dtypes == "string"].index)
-        fk_column_candidates = string_columns - set(core.SCALAR_COLUMNS)
+        if metadata is not None:
+            string_columns = [column for column in Adapter._get_text_columns(metadata) if column in df.columns]
+        else:
+            converted_df = df.convert_dtypes()
+            string_columns = list(converted_df.dtypes[converted_df.dtypes == "string"].index)
+        fk_column_candidates = [column for column in string_columns if column not in core.SCALAR_COLUMNS]
         logging.info(f"Possible FK candidates for {process=}: {fk_column_candidates}")
 
         # Check if Fks are unique (cannot have different FKs per process/subprocess)
         fk_candidates = {}
         for fk_column in fk_column_candidates:
             column_data_without_none = df[fk_column][~df[fk_column].isnull()]
+            if column_data_without_none.empty:
+                continue  # no candidate
             if len(column_data_without_none.unique()) > 1:
                 continue  # no candidate
             fk = column_data_without_none.iloc[0]
-            if "." not in fk:
+            if not isinstance(fk, str) or "." not in fk:
                 continue  # no candidate
             if df[fk_column].isnull().sum() > 0:
                 logging.warning(
@@ -473,6 +1190,132 @@ class Adapter:
         return fk_candidates
 
 
+def _get_kind(value) -> str:
+    """Returns numpy kind of value ("b", "i", "f") or "O" for non-numeric values"""
+    return next((kind for kind, types in NUMERIC_TYPES.items() if isinstance(value, types)), "O")
+
+
+def _build_row(values: Iterable) -> (list, str):
+    """Builds merged row as if values were added one by one to an empty `pd.Series` of dtype object.
+
+    This keeps dtypes of merged parameters as they were when rows were built as series per group:
+    the first value determines the dtype of the row, ints are upcast to float by following floats
+    or missing values, until another value turns the row into dtype object.
+
+    Returns
+    -------
+    (list, str)
+        Row values and kind of row dtype ("b", "i", "f" or "O")
+    """
+    row = []
+    kind = None
+    for value in values:
+        if kind is None:
+            # Missing first value keeps dtype object
+            kind = _get_kind(value)
+        elif kind != "O":
+            value_kind = "f" if value is None else _get_kind(value)
+            if value is None:
+                value = math.nan
+            if {kind, value_kind} == {"i", "f"}:
+                row = [float(item) for item in row]
+                value = float(value)
+                kind = "f"
+            elif kind != value_kind:
+                kind = "O"
+        row.append(value)
+    return row, kind
+
+
+def _get_worker_settings() -> dict:
+    """Returns settings which must be the same in worker processes."""
+    return {name: getattr(settings, name) for name in WORKER_SETTINGS}
+
+
+def _init_worker(worker_settings: dict):
+    """Applies settings of main process in worker process."""
+    for name, value in worker_settings.items():
+        setattr(settings, name, value)
+
+
+def _load_processes(
+    collection_name: str,
+    processes: list[str],
+    units: list[str],
+    foreign_key_cache_size: Optional[int],
+    timeseries_format: str,
+) -> dict[str, Union[Process, Exception]]:
+    """Loads processes in worker process."""
+    adapter = Adapter(
+        collection_name,
+        units=units,
+        foreign_key_cache_size=foreign_key_cache_size,
+        timeseries_format=timeseries_format,
+    )
+    return adapter._load_processes(processes)
+
+
+class _ArtifactFrames:
+    """Holds artifact data which has been read once for multiple processes.
+
+    Artifacts with multiple subprocesses are split by type, empty types belonging to the table process.
+    Artifacts can be loaded from multiple threads; each artifact is read only once.
+    """
+
+    def __init__(self):
+        self.__frames: dict[collection.Artifact, tuple[pd.DataFrame, Optional[dict]]] = {}
+        self.__locks: dict[collection.Artifact, threading.Lock] = {}
+        self.__lock = threading.Lock()
+
+    def load(self, artifact: collection.Artifact) -> tuple[pd.DataFrame, Optional[dict]]:
+        """Reads artifact, if not read yet, and returns its data together with row positions per type."""
+        with self.__lock:
+            artifact_lock = self.__locks.setdefault(artifact, threading.Lock())
+        with artifact_lock:
+            if artifact not in self.__frames:
+                df = artifact.read()
+                types = None
+                if artifact.multiple_types:
+                    df["type"] = df["type"].fillna(artifact.metadata["name"])
+                    types = df.groupby("type", sort=False).indices
+                self.__frames[artifact] = (df, types)
+            return self.__frames[artifact]
+
+    def release(self, keep: Iterable[collection.Artifact] = ()):
+        """Drops data of all artifacts except given ones."""
+        keep = set(keep)
+        with self.__lock:
+            for artifact in list(self.__frames):
+                if artifact in keep:
+                    continue
+                self.__frames.pop(artifact, None)
+                self.__locks.pop(artifact, None)
+
+    def get(self, artifact: collection.Artifact, process: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Returns copy of artifact data for given process, reading artifact on first access.
+
+        Parameters
+        ----------
+        artifact: collection.Artifact
+            Artifact to get data from
+        process: str
+            Process to select rows for (only used if artifact holds multiple types)
+        columns: Optional[Iterable[str]]
+            Columns to select; if not given, all columns are returned
+
+        Returns
+        -------
+        pd.DataFrame
+            Data of artifact, in same row and column order as reading artifact directly
+        """
+        df, types = self.load(artifact)
+        if types is not None:
+            df = df.iloc[types.get(process, [])]
+        if columns is not None:
+            df = df[[column for column in df.columns if column in columns]]
+        return df.copy()
+
+
 def get_process(collection_name: str, process: str) -> Process:
     """Loads data for given process from collection. (Deprecated! Use Adapter class instead).
 
@@ -0,0 +1,453 @@
+"""Module holds readers to load artifact CSV files into dataframes."""
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Callable, Collection, Iterable, Optional
+
+import frictionless
+import numpy as np
+import pandas as pd
+
+from data_adapter import core
+
+# Values which are read as missing values (same as frictionless default)
+MISSING_VALUES = [""]
+
+# Key of artifact cache info in parquet schema metadata
+CACHE_METADATA_KEY = b"data_adapter"
+
+# Hashes of source files together with file stats (mtime, size) at hashing time
+_FILE_HASHES: dict[pathlib.Path, tuple[tuple[int, int], str]] = {}
+
+
+class ReaderError(Exception):
+    """Raised if artifact data cannot be read."""
+
+
+def get_table_schema(metadata: dict, columns: Optional[Iterable[str]] = None) -> dict:
+    """Returns frictionless table schema from OEP metadata, reduced to given columns and primary key.
+
+    Parameters
+    ----------
+    metadata: dict
+        OEP metadata of CSV file
+    columns: Optional[Iterable[str]]
+        Columns to keep in schema; columns not found in schema are ignored. If not set, all columns are kept.
+
+    Returns
+    -------
+    dict
+        Frictionless table schema
+    """
+    fl_table_schema = core.reformat_oep_to_frictionless_schema(metadata["resources"][0]["schema"])
+    if columns is None:
+        return fl_table_schema
+    columns = set(columns).union(fl_table_schema["primaryKey"])
+    fl_table_schema["fields"] = [field for field in fl_table_schema["fields"] if field["name"] in columns]
+    return fl_table_schema
+
+
+def get_filter_mask(df: pd.DataFrame, metadata: dict, filters: dict[str, Collection]) -> np.ndarray:
+    """Returns mask of rows matching all given filters.
+
+    A row matches a filter, if its value is in the collection of allowed values of the filter.
+    Rows with missing values match, if None is in allowed values.
+    Rows of array columns match, if any of the array items is in allowed values.
+    Filters on columns not found in dataframe are ignored.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Parsed data
+    metadata: dict
+        OEP metadata of data
+    filters: dict[str, Collection]
+        Allowed values per column
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of matching rows
+    """
+    field_types = {field["name"]: field["type"] for field in metadata["resources"][0]["schema"]["fields"]}
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in filters.items():
+        if column not in df.columns:
+            continue
+        allowed = set(values)
+        if "array" in field_types.get(column, ""):
+            mask &= np.array(
+                [(None in allowed) if cell is None else any(item in allowed for item in cell) for cell in df[column]],
+                dtype=bool,
+            )
+            continue
+        matches = df[column].isin(allowed - {None}).to_numpy(dtype=bool)
+        if None in allowed:
+            matches |= df[column].isna().to_numpy()
+        mask &= matches
+    return mask
+
+
+def read_csv_with_frictionless(
+    path: pathlib.Path,
+    metadata: dict,
+    columns: Optional[Iterable[str]] = None,
+    filters: Optional[dict[str, Collection]] = None,
+) -> pd.DataFrame:
+    """Reads CSV via frictionless resource.
+
+    Cells are parsed and cast row by row and invalid cells are set to None.
+    If filters are given, matching rows are looked up by reading filter columns only,
+    afterwards, only matching rows are parsed and cast by frictionless.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        Path to CSV file
+    metadata: dict
+        OEP metadata of CSV file
+    columns: Optional[Iterable[str]]
+        Only given columns (and primary key) are read. If not set, all columns are read.
+    filters: Optional[dict[str, Collection]]
+        Only rows matching given filters are read (see `get_filter_mask`)
+
+    Returns
+    -------
+    pd.DataFrame
+        Data of CSV file, indexed by primary key
+    """
+    fl_table_schema = get_table_schema(metadata, columns)
+    layout_options = {}
+    if columns is not None:
+        layout_options["pick_fields"] = [field["name"] for field in fl_table_schema["fields"]]
+    if filters:
+        filter_df = read_csv_with_pandas(path, metadata, columns=filters)
+        row_positions = np.flatnonzero(get_filter_mask(filter_df, metadata, filters))
+        # Row numbers start at 1 and include header row
+        layout_options["pick_rows"] = [1] + (row_positions + 2).tolist()
+    resource = frictionless.Resource(
+        name=metadata["name"],
+        profile="tabular-data-resource",
+        source=path,
+        schema=fl_table_schema,
+        format="csv",
+        layout=frictionless.Layout(**layout_options) if layout_options else None,
+    )
+    return resource.to_pandas()
+
+
+def read_csv_with_pandas(
+    path: pathlib.Path,
+    metadata: dict,
+    columns: Optional[Iterable[str]] = None,
+    filters: Optional[dict[str, Collection]] = None,
+) -> pd.DataFrame:
+    """Reads CSV via pandas and converts columns in bulk depending on schema.
+
+    Cells are cast like in frictionless (invalid cells are set to None),
+    thus, returned dataframe equals the one from `read_csv_with_frictionless`.
+    Use frictionless reader in order to validate data.
+    If schema holds types which cannot be converted in bulk (i.e. boolean, date, time or year),
+    CSV is read via `read_csv_with_frictionless` instead.
+    If filters are given, filter columns are converted first and
+    remaining columns are only converted for matching rows.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        Path to CSV file
+    metadata: dict
+        OEP metadata of CSV file
+    columns: Optional[Iterable[str]]
+        Only given columns (and primary key) are parsed. If not set, all columns are parsed.
+    filters: Optional[dict[str, Collection]]
+        Only rows matching given filters are returned (see `get_filter_mask`)
+
+    Returns
+    -------
+    pd.DataFrame
+        Data of CSV file, indexed by primary key
+
+    Raises
+    ------
+    ReaderError
+        if CSV cannot be parsed
+    """
+    filters = filters or {}
+    fl_table_schema = get_table_schema(metadata, None if columns is None else set(columns).union(filters))
+    field_types = {field["name"]: field["type"] for field in fl_table_schema["fields"]}
+    unsupported_types = sorted({type_ for type_ in field_types.values() if type_ not in _CONVERTERS})
+    if unsupported_types:
+        logging.debug(f"Reading '{path}' via frictionless, as pandas engine cannot convert types {unsupported_types}.")
+        return read_csv_with_frictionless(path, metadata, columns=columns, filters=filters)
+    try:
+        raw_df = pd.read_csv(
+            path,
+            usecols=list(field_types),
+            dtype=object,
+            keep_default_na=False,
+            na_values=MISSING_VALUES,
+        )
+    except ValueError as error:
+        raise ReaderError(f"Could not read CSV file '{path}': {error}") from error
+
+    filter_columns = [name for name in filters if name in field_types]
+    converted = {name: _CONVERTERS[field_types[name]](raw_df[name]) for name in filter_columns}
+    if filter_columns:
+        mask = get_filter_mask(pd.DataFrame(converted), metadata, filters)
+        raw_df = raw_df[mask]
+        converted = {name: values[mask] for name, values in converted.items()}
+    if raw_df.empty:
+        # Same as frictionless, empty dataframe holds objects only
+        converted = {name: raw_df[name].astype(object) for name in field_types}
+    for name, type_ in field_types.items():
+        if name not in converted:
+            converted[name] = _CONVERTERS[type_](raw_df[name])
+    df = pd.DataFrame({name: converted[name] for name in field_types}, index=raw_df.index)
+
+    primary_key = fl_table_schema["primaryKey"]
+    if primary_key:
+        df = df.set_index(primary_key if len(primary_key) > 1 else primary_key[0])
+        if raw_df.empty and len(primary_key) == 1 and field_types[primary_key[0]] == "integer":
+            df.index = df.index.astype("int64")
+    requested_columns = field_types if columns is None else set(columns)
+    return df[[name for name in field_types if name not in primary_key and name in requested_columns]]
+
+
+def _cast_cells(cells: np.ndarray, cast: Callable) -> list:
+    """Casts cells one by one and sets cells which cannot be cast to None."""
+    values = []
+    for cell in cells:
+        try:
+            values.append(cast(cell))
+        except (TypeError, ValueError):
+            values.append(None)
+    return values
+
+
+def _convert_integer(column: pd.Series) -> pd.Series:
+    cells = column[column.notna()].to_numpy()
+    try:
+        values = cells.astype(np.int64)
+    except (TypeError, ValueError, OverflowError):
+        values = _cast_cells(cells, int)
+    if len(values) == len(column) and None not in values:
+        return pd.Series(values, index=column.index, dtype="int64", name=column.name)
+    converted = pd.Series(None, index=column.index, dtype="Int64", name=column.name)
+    converted[column.notna()] = pd.array(values, dtype="Int64")
+    return converted
+
+
+def _convert_number(column: pd.Series) -> pd.Series:
+    cells = column.to_numpy()
+    try:
+        # Casting of strings uses python's float(), as frictionless does
+        values = cells.astype(np.float64)
+    except (TypeError, ValueError):
+        values = np.array([np.nan if value is None else value for value in _cast_cells(cells, float)], dtype=np.float64)
+    return pd.Series(values, index=column.index, name=column.name)
+
+
+def _convert_string(column: pd.Series) -> pd.Series:
+    return column.astype(object).where(column.notna(), None)
+
+
+def _convert_datetime(column: pd.Series) -> pd.Series:
+    # Same guard as in frictionless: shorter ISO 8601 formats (i.e. dates without time) are invalid
+    cells = column.astype(object)
+    is_valid = cells.str.len().ge(19).fillna(False) & cells.str[16].eq(":").fillna(False)
+    converted = pd.to_datetime(cells.where(is_valid, None), format="ISO8601", errors="coerce")
+    if converted.isna().all():
+        # Same as frictionless, column without any valid datetime holds None only
+        return pd.Series(None, index=column.index, dtype=object, name=column.name)
+    return converted
+
+
+def _get_json_converter(json_type: type) -> Callable[[pd.Series], pd.Series]:
+    brackets = ("[", "]") if json_type is list else ("{", "}")
+
+    def decode_json(cell: str):
+        value = json.loads(cell)
+        if not isinstance(value, json_type):
+            raise ValueError(f"Value is not of type '{json_type.__name__}'.")
+        return value
+
+    def convert_json(column: pd.Series) -> pd.Series:
+        """Decodes all JSON cells of column at once by joining them into a single JSON array.
+
+        If joined JSON cannot be decoded, cells are decoded one by one and invalid cells are set to None.
+        """
+        is_missing = column.isna().to_numpy()
+        cells = np.where(is_missing, "null", column.to_numpy())
+        values = None
+        if all(cell == "null" or (cell[:1] == brackets[0] and cell[-1:] == brackets[1]) for cell in cells):
+            try:
+                values = json.loads("[" + ",".join(cells) + "]")
+            except json.JSONDecodeError:
+                values = None
+        # Length and type check detect cells which are no valid JSON on their own (i.e. '[1, 2], [3]')
+        if (
+            values is None
+            or len(values) != len(cells)
+            or not all(value is None or isinstance(value, json_type) for value in values)
+        ):
+            values = _cast_cells(cells, decode_json)
+        return pd.Series(values, index=column.index, dtype=object, name=column.name)
+
+    return convert_json
+
+
+_CONVERTERS = {
+    "integer": _convert_integer,
+    "number": _convert_number,
+    "string": _convert_string,
+    "any": _convert_string,
+    "datetime": _convert_datetime,
+    "array": _get_json_converter(list),
+    "object": _get_json_converter(dict),
+}
+
+
+def get_file_hash(path: pathlib.Path) -> str:
+    """Returns hash of file content; hash is only recalculated if modification time or size of file changed."""
+    stat = path.stat()
+    file_stats = (stat.st_mtime_ns, stat.st_size)
+    cached = _FILE_HASHES.get(path)
+    if cached is not None and cached[0] == file_stats:
+        return cached[1]
+    file_hash = hashlib.blake2b(path.read_bytes(), digest_size=8).hexdigest()
+    _FILE_HASHES[path] = (file_stats, file_hash)
+    return file_hash
+
+
+def get_cache_path(path: pathlib.Path, engine: str = "frictionless") -> pathlib.Path:
+    """Returns path of columnar cache file for given CSV, keyed by hash of CSV file and engine which parsed it.
+
+    Thus, data parsed by fast pandas engine is never served to callers asking for (validating) frictionless engine.
+    """
+    return path.with_name(f"{path.stem}.{get_file_hash(path)}.{engine}.parquet")
+
+
+def read_cache(
+    path: pathlib.Path,
+    metadata: dict,
+    columns: Optional[Iterable[str]] = None,
+    filters: Optional[dict[str, Collection]] = None,
+    engine: str = "frictionless",
+) -> Optional[pd.DataFrame]:
+    """Reads parsed CSV data from columnar cache file.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        Path to CSV file
+    metadata: dict
+        OEP metadata of CSV file
+    columns: Optional[Iterable[str]]
+        Only given columns (and index) are read. If not set, all columns are read.
+    filters: Optional[dict[str, Collection]]
+        Only rows matching given filters are returned (see `get_filter_mask`)
+    engine: str
+        Engine which parsed cached data
+
+    Returns
+    -------
+    Optional[pd.DataFrame]
+        Cached data of CSV file or None, if no cache for current CSV file and engine exists
+        (or cache file cannot be read, i.e. as it is replaced by another process meanwhile)
+    """
+    pq = _import_parquet()
+    cache_path = get_cache_path(path, engine)
+    if not cache_path.exists():
+        return None
+    try:
+        cache_info = json.loads(pq.read_schema(cache_path).metadata[CACHE_METADATA_KEY])
+        if columns is not None:
+            columns = set(columns)
+            cache_info = {key: [name for name in names if name in columns] for key, names in cache_info.items()}
+        # Index columns are restored from pandas metadata in parquet file
+        table = pq.read_table(cache_path, columns=cache_info["columns"], use_pandas_metadata=True)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        # Cache file might be replaced or removed by another process meanwhile
+        logging.debug(f"Could not read cache file '{cache_path}': {error}")
+        return None
+    if filters:
+        filter_df = read_cache(path, metadata, columns=filters, engine=engine)
+        if filter_df is None:
+            return None
+        table = table.filter(get_filter_mask(filter_df, metadata, filters))
+    json_columns = cache_info["array_columns"] + cache_info["json_columns"]
+    df = table.drop(json_columns).to_pandas()
+    for json_type, names in ((list, cache_info["array_columns"]), (dict, cache_info["json_columns"])):
+        for name in names:
+            df[name] = _get_json_converter(json_type)(
+                pd.Series(table.column(name).to_pylist(), index=df.index, dtype=object)
+            )
+    return df[cache_info["columns"]]
+
+
+def write_cache(path: pathlib.Path, metadata: dict, df: pd.DataFrame, engine: str = "frictionless"):
+    """Writes parsed CSV data into typed columnar cache file next to CSV file.
+
+    Array and JSON columns are stored as JSON strings, thus, types of items (i.e. int or float) are kept.
+    Cache files of former versions of CSV file (parsed by same engine) are removed.
+    Cache file is written into a temporary file first and moved afterwards, thus, readers never see partial files.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+        Path to CSV file
+    metadata: dict
+        OEP metadata of CSV file
+    df: pd.DataFrame
+        Parsed data of CSV file
+    engine: str
+        Engine which parsed data
+    """
+    pq = _import_parquet()
+    import pyarrow as pa
+
+    fields = {field["name"]: field["type"] for field in metadata["resources"][0]["schema"]["fields"]}
+    array_columns = [name for name in df.columns if "array" in fields.get(name, "")]
+    json_columns = [name for name in df.columns if fields.get(name) == "json"]
+    cache_df = df.copy()
+    for name in array_columns + json_columns:
+        cache_df[name] = [None if value is None else json.dumps(value) for value in cache_df[name]]
+    try:
+        table = pa.Table.from_pandas(cache_df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as error:
+        logging.warning(f"Could not cache data of '{path}': {error}")
+        return
+    cache_info = {"columns": list(df.columns), "array_columns": array_columns, "json_columns": json_columns}
+    table = table.replace_schema_metadata({**table.schema.metadata, CACHE_METADATA_KEY: json.dumps(cache_info)})
+
+    cache_path = get_cache_path(path, engine)
+    for outdated_cache_path in path.parent.glob(f"{path.stem}.*.{engine}.parquet"):
+        if outdated_cache_path != cache_path:
+            outdated_cache_path.unlink(missing_ok=True)
+    # Each writer uses its own temporary file, thus, concurrent writers (i.e. pool workers) do not interfere
+    temp_fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{cache_path.name}.", suffix=".tmp")
+    os.close(temp_fd)
+    try:
+        pq.write_table(table, temp_name)
+        os.replace(temp_name, cache_path)
+    except BaseException:
+        pathlib.Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _import_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("You must install pyarrow in order to use artifact cache.")
+    return pq
+
+
+READERS = {
+    "frictionless": read_csv_with_frictionless,
+    "pandas": read_csv_with_pandas,
+}
@@ -9,6 +9,13 @@ logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
 
 USE_ANNOTATIONS = os.environ.get("USE_ANNOTATIONS", "False") == "True"
 
+# Engine to read artifact CSVs: "frictionless" (validating) or "pandas" (fast)
+CSV_ENGINE = os.environ.get("CSV_ENGINE", "frictionless")
+# Store parsed artifacts as parquet files next to artifact CSVs and read them on later runs (needs pyarrow)
+USE_ARTIFACT_CACHE = os.environ.get("USE_ARTIFACT_CACHE", "False") == "True"
+# Store parsed structure workbooks as JSON files next to workbooks and read them on later runs
+USE_STRUCTURE_CACHE = os.environ.get("USE_STRUCTURE_CACHE", "False") == "True"
+
 ROOT_DIR = pathlib.Path(__file__).parent.parent
 COLLECTIONS_DIR = (
     pathlib.Path(os.environ["COLLECTIONS_DIR"])
@@ -1,19 +1,38 @@
 from __future__ import annotations
 
+import json
+import logging
+import os
+import pathlib
 import re
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
 
-from data_adapter import settings
+from data_adapter import readers, settings
 
 MAX_IDENTIFIER_LENGTH = 50
 
 # pylint:disable=C0209
 IDENTIFIER_PATTERN = re.compile("^[a-z][a-z0-9_, ]{0,%s}$" % (MAX_IDENTIFIER_LENGTH - 1))
 
+# Columns read from process (and helper) sheet and from parameter sheet
+PROCESS_COLUMNS = ("process", "input", "output")
+PARAMETER_COLUMNS = ("parameter", "process", "inputs", "outputs")
+# Formats of structure tables in structure directory (stored as "<structure>/<sheet>.<format>"), in order of lookup
+TABLE_FORMATS = ("parquet", "csv", "json")
+# File in structure directory holding hash of workbook tables have been exported from
+TABLE_SOURCE_FILE = "source.json"
+
+# Roles of sectors for commodities (as bit flags) in commodity interfaces
+INTERFACE_ROLES = {"input": 1, "output": 2, "source": 4, "import": 8}
+# Relation codes of sectors and commodities in commodity interface matrix
+INTERFACE_CODES = {"input": -1, "input_output": 0, "output": 1, "source": 2, "source_output": 3}
+# Processes with any of these keywords in name are not part of commodity interfaces
+INTERFACE_EXCLUDED_KEYWORDS = ("storage", "export", "delivery")
+
 
 class StructureError(Exception):
     """Raised if structure is corrupted."""
@@ -44,99 +63,319 @@ def check_character_convention(dataframe: pd.DataFrame, cols: Optional[List[str]
                 raise ValueError(f"Wrong syntax: {element}\nAllowed are characters: a-z and 0-9 and , and _")
 
 
-def _initialize_commodities(sectors):
-    return {sector: set() for sector in sectors}
-
-
-def _process_row(
-    process_name, io_dict, category, input_commodities, output_commodities, source_commodities, import_commodities
-):
-    row_sectors = [process_name.split("_")[0]]
-    inputs = [num for item in io_dict["inputs"] for num in (item if isinstance(item, list) else (item,))]
-    outputs = [num for item in io_dict["outputs"] for num in (item if isinstance(item, list) else (item,))]
-
-    categories_set = set([category.split("_")[0] for category in inputs + outputs])
-
-    sources = [
-        num
-        for item in io_dict["outputs"]
-        if "source" in process_name
-        for num in (item if isinstance(item, list) else (item,))
-    ]
-    imports = [
-        num
-        for item in io_dict["outputs"]
-        if "import" in process_name
-        for num in (item if isinstance(item, list) else (item,))
-    ]
-
-    for sector in row_sectors:
-        if category in categories_set:
-            input_commodities[sector] |= set([commodity for commodity in inputs if commodity.startswith(category)])
-            source_commodities[sector] |= set([commodity for commodity in sources if commodity.startswith(category)])
-            import_commodities[sector] |= set([commodity for commodity in imports if commodity.startswith(category)])
-            output_commodities[sector] |= set([commodity for commodity in outputs if commodity.startswith(category)])
-
-
-def _create_matrix_data(input_commodities, output_commodities, source_commodities, import_commodities, sectors):
-    combined = {
-        sector: list(
-            input_commodities[sector]
-            | output_commodities[sector]
-            | source_commodities[sector]
-            | import_commodities[sector]
-        )
-        for sector in sectors
-    }
-
-    unique_commodity_list = sorted(list(set(commodity for sector in combined.values() for commodity in sector)))
-
-    matrix_data = pd.DataFrame(np.NaN, index=unique_commodity_list, columns=sectors)
-
-    # Populate matrix_data based on conditions
-    for sector in sectors:
-        for commodity in combined[sector]:
-            # if commodity in import_commodities[sector]:
-            #     matrix_data.at[commodity, sector] = 3
-            if commodity in input_commodities[sector] and commodity in output_commodities[sector]:
-                matrix_data.at[commodity, sector] = 0
-            elif commodity in input_commodities[sector]:
-                matrix_data.at[commodity, sector] = -1
-            elif commodity in output_commodities[sector]:
-                matrix_data.at[commodity, sector] = 1
-            if commodity in source_commodities[sector] and commodity in output_commodities[sector]:
-                matrix_data.at[commodity, sector] = 3
-            elif commodity in source_commodities[sector]:
-                matrix_data.at[commodity, sector] = 2
-
-    return matrix_data
-
-
-def _process_data(category, sectors, processes):
-    input_commodities = _initialize_commodities(sectors)
-    output_commodities = _initialize_commodities(sectors)
-    source_commodities = _initialize_commodities(sectors)
-    import_commodities = _initialize_commodities(sectors)
-
-    for process_name, io_dict in processes.items():
-        if any([keyword in process_name for keyword in ["storage", "export", "delivery"]]):
-            continue
+def flatten_nodes(nodes: list) -> list[str]:
+    """Flattens grouped nodes (i.e. `[["electricity", "heat"], "co2"]`) into list of commodities."""
+    return [node for item in nodes for node in (item if isinstance(item, list) else (item,))]
 
-        _process_row(
-            process_name,
-            io_dict,
-            category,
-            input_commodities,
-            output_commodities,
-            source_commodities,
-            import_commodities,
+
+@dataclass
+class CommodityGraph:
+    """Bipartite index of commodities and processes of a structure.
+
+    Commodities and processes are listed in order of appearance in structure.
+    """
+
+    producers: dict[str, list[str]]
+    consumers: dict[str, list[str]]
+    inputs: dict[str, list[str]]
+    outputs: dict[str, list[str]]
+
+    @classmethod
+    def from_processes(cls, processes: dict) -> CommodityGraph:
+        """Builds index from processes with (grouped) inputs and outputs, as in `Structure.processes`."""
+        graph = cls(producers={}, consumers={}, inputs={}, outputs={})
+        for process, io_dict in processes.items():
+            graph.inputs[process] = list(dict.fromkeys(flatten_nodes(io_dict["inputs"])))
+            graph.outputs[process] = list(dict.fromkeys(flatten_nodes(io_dict["outputs"])))
+            for commodity in graph.inputs[process]:
+                graph.consumers.setdefault(commodity, []).append(process)
+            for commodity in graph.outputs[process]:
+                graph.producers.setdefault(commodity, []).append(process)
+        return graph
+
+    @property
+    def commodities(self) -> list[str]:
+        """Returns all commodities, consumed or produced."""
+        return list(dict.fromkeys([*self.consumers, *self.producers]))
+
+    def get_reachable(self, commodities: Iterable[str], upstream: bool = False) -> set[str]:
+        """Returns commodities which can be reached from given commodities via processes.
+
+        Parameters
+        ----------
+        commodities: Iterable[str]
+            Commodities to start from (not part of result unless reachable via processes)
+        upstream: bool
+            If set, commodities needed to produce given commodities are returned,
+            otherwise commodities which can be produced from given commodities are returned.
+
+        Returns
+        -------
+        set[str]
+            Reachable commodities
+        """
+        processes_of, commodities_of = (self.producers, self.inputs) if upstream else (self.consumers, self.outputs)
+        reachable = set()
+        visited_processes = set()
+        pending = list(commodities)
+        while pending:
+            commodity = pending.pop()
+            for process in processes_of.get(commodity, ()):
+                if process in visited_processes:
+                    continue
+                visited_processes.add(process)
+                for reached in commodities_of[process]:
+                    if reached not in reachable:
+                        reachable.add(reached)
+                        pending.append(reached)
+        return reachable
+
+
+def get_commodity_incidence(graph: CommodityGraph, categories: Iterable[str]) -> pd.DataFrame:
+    """Returns incidence of sectors and commodities for all given categories, built in a single pass over processes.
+
+    Sector of a process is given by the first part of its name; storage, export and delivery processes are skipped.
+    A process is related to a category, if any of its commodities starts with category as first part of its name.
+    Only related (category, sector, commodity) combinations are listed (sparse incidence).
+
+    Parameters
+    ----------
+    graph: CommodityGraph
+        Index of processes and commodities (see `Structure.commodity_graph`)
+    categories: Iterable[str]
+        Commodity categories (i.e. "pri", "sec")
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns "category", "sector" and "commodity" together with boolean columns per role
+        ("input", "output", "source", "import"), telling how sector relates to commodity
+    """
+    categories = list(dict.fromkeys(categories))
+    incidence: dict[tuple[str, str, str], int] = {}
+    for process in graph.inputs:
+        if any(keyword in process for keyword in INTERFACE_EXCLUDED_KEYWORDS):
+            continue
+        sector = process.split("_")[0]
+        inputs, outputs = graph.inputs[process], graph.outputs[process]
+        process_categories = {commodity.split("_")[0] for commodity in inputs + outputs}
+        output_roles = (
+            INTERFACE_ROLES["output"]
+            | (INTERFACE_ROLES["source"] if "source" in process else 0)
+            | (INTERFACE_ROLES["import"] if "import" in process else 0)
         )
+        for category in categories:
+            if category not in process_categories:
+                continue
+            for commodities, roles in ((inputs, INTERFACE_ROLES["input"]), (outputs, output_roles)):
+                for commodity in commodities:
+                    if commodity.startswith(category):
+                        key = (category, sector, commodity)
+                        incidence[key] = incidence.get(key, 0) | roles
+
+    keys = list(incidence)
+    roles = np.fromiter(incidence.values(), dtype=int, count=len(incidence))
+    return pd.DataFrame(
+        {
+            "category": [key[0] for key in keys],
+            "sector": [key[1] for key in keys],
+            "commodity": [key[2] for key in keys],
+            **{role: (roles & flag).astype(bool) for role, flag in INTERFACE_ROLES.items()},
+        }
+    )
+
+
+def get_interface_matrix(incidence: pd.DataFrame, category: str, sectors: Iterable[str]) -> pd.DataFrame:
+    """Slices commodity interfaces of given category and sectors from incidence.
 
-    matrix_data = _create_matrix_data(
-        input_commodities, output_commodities, source_commodities, import_commodities, sectors
+    Parameters
+    ----------
+    incidence: pd.DataFrame
+        Incidence of sectors and commodities (see `get_commodity_incidence`)
+    category: str
+        Commodity category to get interfaces for
+    sectors: Iterable[str]
+        Sectors to get interfaces for (columns of matrix)
+
+    Returns
+    -------
+    pd.DataFrame
+        Relation codes (see `INTERFACE_CODES`) with sorted commodities as index and sectors as columns;
+        NaN, if sector and commodity are not related
+    """
+    sectors = list(sectors)
+    rows = incidence[(incidence["category"] == category) & incidence["sector"].isin(sectors)]
+    commodities = sorted(set(rows["commodity"]))
+    codes = np.select(
+        [
+            rows["source"] & rows["output"],
+            rows["source"],
+            rows["input"] & rows["output"],
+            rows["input"],
+            rows["output"],
+        ],
+        [
+            INTERFACE_CODES["source_output"],
+            INTERFACE_CODES["source"],
+            INTERFACE_CODES["input_output"],
+            INTERFACE_CODES["input"],
+            INTERFACE_CODES["output"],
+        ],
+        default=np.nan,
     )
+    values = np.full((len(commodities), len(sectors)), np.nan)
+    values[pd.Index(commodities).get_indexer(rows["commodity"]), pd.Index(sectors).get_indexer(rows["sector"])] = codes
+    return pd.DataFrame(values, index=commodities, columns=sectors)
+
+
+def _read_workbook_tables(structure_file: pathlib.Path, sheets: dict[str, str]) -> dict[str, Optional[pd.DataFrame]]:
+    """Reads process, helper and parameter tables from structure workbook, opening workbook only once (read-only)."""
+    with pd.ExcelFile(structure_file, engine="openpyxl") as workbook:
+        return {
+            "process": pd.read_excel(workbook, sheet_name=sheets["process"], usecols=PROCESS_COLUMNS),
+            "helper": pd.read_excel(workbook, sheet_name=sheets["helper"], usecols=PROCESS_COLUMNS)
+            if sheets["helper"] in workbook.sheet_names
+            else None,
+            "parameter": pd.read_excel(workbook, sheet_name=sheets["parameter"], usecols=PARAMETER_COLUMNS),
+        }
+
+
+def _find_table(structure_dir: pathlib.Path, sheet: str) -> Optional[pathlib.Path]:
+    """Returns path of table for given sheet in structure directory or None, if table does not exist."""
+    paths = (structure_dir / f"{sheet}.{table_format}" for table_format in TABLE_FORMATS)
+    return next((path for path in paths if path.exists()), None)
+
+
+def _read_table(path: pathlib.Path, columns: tuple[str, ...]) -> pd.DataFrame:
+    """Reads structure table from CSV, JSON (split orientation) or parquet file.
+
+    Raises
+    ------
+    StructureError
+        if table misses any of given columns
+    """
+    if path.suffix == ".csv":
+        table = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
+    elif path.suffix == ".json":
+        table = pd.read_json(path, orient="split", dtype=False)
+    else:
+        table = pd.read_parquet(path)
+    missing_columns = [column for column in columns if column not in table.columns]
+    if missing_columns:
+        raise StructureError(f"Structure table '{path}' misses columns {missing_columns}.")
+    return table[list(columns)]
+
+
+def _is_outdated(structure_dir: pathlib.Path, structure_file: pathlib.Path) -> bool:
+    """Returns True, if tables in structure directory have been exported from another version of workbook."""
+    source_path = structure_dir / TABLE_SOURCE_FILE
+    if not source_path.exists() or not structure_file.exists():
+        return False
+    with open(source_path, "r", encoding="utf-8") as source_file:
+        source = json.load(source_file)
+    return source.get("workbook_hash") != readers.get_file_hash(structure_file)
+
+
+def _read_directory_tables(structure_dir: pathlib.Path, sheets: dict[str, str]) -> dict[str, Optional[pd.DataFrame]]:
+    """Reads process, helper and parameter tables from structure directory (helper table is optional)."""
+    tables = {}
+    for table, sheet in sheets.items():
+        path = _find_table(structure_dir, sheet)
+        if path is None:
+            if table == "helper":
+                tables[table] = None
+                continue
+            raise FileNotFoundError(
+                f"Could not find table for sheet '{sheet}' in structure directory '{structure_dir}'. "
+                f"Table must be stored in one of formats {TABLE_FORMATS}."
+            )
+        tables[table] = _read_table(path, PARAMETER_COLUMNS if table == "parameter" else PROCESS_COLUMNS)
+    return tables
+
 
-    return matrix_data
+def export_structure(
+    structure_name: str,
+    table_format: str = "csv",
+    process_sheet: str = "Process_Set",
+    parameter_sheet: str = "Parameter_Input-Output",
+    helper_sheet: str = "Helper_Set",
+) -> pathlib.Path:
+    """Exports sheets of structure workbook into tables in structure directory.
+
+    Afterwards, `Structure(structure_name)` reads tables from structure directory instead of workbook,
+    as long as workbook is not changed (hash of workbook is stored next to tables).
+
+    Parameters
+    ----------
+    structure_name: str
+        Name of structure workbook (without suffix) in structures folder
+    table_format: str
+        Format of exported tables, one of "csv", "json" or "parquet" (needs pyarrow)
+    process_sheet: str
+        Sheet to read processes from
+    parameter_sheet: str
+        Sheet to read parameters from
+    helper_sheet: str
+        Sheet to read additional helper processes from (exported only if present in workbook)
+
+    Returns
+    -------
+    pathlib.Path
+        Path to structure directory
+    """
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown {table_format=}, must be one of {TABLE_FORMATS}.")
+    sheets = {"process": process_sheet, "helper": helper_sheet, "parameter": parameter_sheet}
+    structure_file = settings.STRUCTURES_DIR / f"{structure_name}.xlsx"
+    tables = _read_workbook_tables(structure_file, sheets)
+    structure_dir = settings.STRUCTURES_DIR / structure_name
+    structure_dir.mkdir(exist_ok=True)
+    for table, sheet in sheets.items():
+        # Tables of other formats would shadow exported table
+        for path in structure_dir.glob(f"{sheet}.*"):
+            if path.suffix[1:] in TABLE_FORMATS:
+                path.unlink()
+        if tables[table] is None:
+            continue
+        path = structure_dir / f"{sheet}.{table_format}"
+        if table_format == "csv":
+            tables[table].to_csv(path, index=False)
+        elif table_format == "json":
+            # Split orientation keeps columns of empty tables
+            tables[table].to_json(path, orient="split", index=False, force_ascii=False)
+        else:
+            tables[table].to_parquet(path, index=False)
+    with open(structure_dir / TABLE_SOURCE_FILE, "w", encoding="utf-8") as source_file:
+        json.dump({"workbook_hash": readers.get_file_hash(structure_file)}, source_file)
+    return structure_dir
+
+
+def get_structure_cache_path(structure_file: pathlib.Path) -> pathlib.Path:
+    """Returns path of parsed structure cache file for given workbook, keyed by hash of workbook."""
+    return structure_file.with_name(f"{structure_file.stem}.{readers.get_file_hash(structure_file)}.cache.json")
+
+
+def _read_structure_cache(structure_file: pathlib.Path, sheets: list[str]) -> Optional[dict]:
+    """Returns cached processes and parameters or None, if no cache for current workbook and sheets exists."""
+    cache_path = get_structure_cache_path(structure_file)
+    if not cache_path.exists():
+        return None
+    with open(cache_path, "r", encoding="utf-8") as cache_file:
+        cached = json.load(cache_file)
+    if cached.get("sheets") != sheets:
+        return None
+    return cached
+
+
+def _write_structure_cache(structure_file: pathlib.Path, sheets: list[str], structure: dict):
+    """Writes parsed structure next to workbook; cache files of former versions of workbook are removed."""
+    cache_path = get_structure_cache_path(structure_file)
+    for outdated_cache_path in structure_file.parent.glob(f"{structure_file.stem}.*.cache.json"):
+        outdated_cache_path.unlink()
+    temp_path = cache_path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as cache_file:
+        json.dump({"sheets": sheets, **structure}, cache_file)
+    os.replace(temp_path, cache_path)
 
 
 class Structure:
@@ -146,20 +385,77 @@ class Structure:
         process_sheet: str = "Process_Set",
         parameter_sheet: str = "Parameter_Input-Output",
         helper_sheet: str = "Helper_Set",
+        use_cache: Optional[bool] = None,
     ):
-        self.structure_file = settings.STRUCTURES_DIR / f"{structure_name}.xlsx"
-        self.processes = self._init_processes(process_sheet, helper_sheet)
-        self.parameters = self._init_parameters(parameter_sheet)
-
-    def _init_processes(self, process_sheet: str, helper_sheet: str) -> dict:
-        """Parse (helper) processes with corresponding inputs and outputs to dict.
+        """Structure holds processes and parameters together with their inputs and outputs.
 
         Parameters
         ----------
+        structure_name: str
+            Name of structure in structures folder; tables are read from directory "<structure_name>"
+            (see `export_structure`), if present and not outdated, otherwise from workbook "<structure_name>.xlsx".
+            Tables are outdated, if workbook has changed since tables have been exported from it.
         process_sheet: str
             Sheet to read processes from
+        parameter_sheet: str
+            Sheet to read parameters from
         helper_sheet: str
-            Sheet to read additional helper processes from
+            Sheet to read additional helper processes from (optional in workbook)
+        use_cache: Optional[bool]
+            Read parsed structure from (and write it to) JSON cache file next to workbook.
+            If not set, settings value USE_STRUCTURE_CACHE is used. Not used for structure directories.
+
+        Attribute `structure_file` always holds path of workbook, whereas `structure_source` holds path of
+        structure directory or workbook, depending on where structure has been read from.
+        """
+        sheets = {"process": process_sheet, "helper": helper_sheet, "parameter": parameter_sheet}
+        self.__load(structure_name, sheets, use_cache)
+        # Index of commodities and processes, built once; queries on commodities use this index
+        self.commodity_graph = CommodityGraph.from_processes(self.processes)
+
+    def __load(self, structure_name: str, sheets: dict[str, str], use_cache: Optional[bool]):
+        """Loads processes and parameters from structure directory, structure cache or workbook."""
+        structure_dir = settings.STRUCTURES_DIR / structure_name
+        self.structure_file = settings.STRUCTURES_DIR / f"{structure_name}.xlsx"
+        if structure_dir.is_dir():
+            if not _is_outdated(structure_dir, self.structure_file):
+                self.structure_source = structure_dir
+                self.__init_from_tables(_read_directory_tables(structure_dir, sheets))
+                return
+            logging.warning(
+                f"Tables in structure directory '{structure_dir}' are outdated, as workbook '{self.structure_file}' "
+                "has changed since export. Structure is read from workbook instead; export structure again."
+            )
+
+        self.structure_source = self.structure_file
+        use_cache = settings.USE_STRUCTURE_CACHE if use_cache is None else use_cache
+        if use_cache:
+            cached = _read_structure_cache(self.structure_file, list(sheets.values()))
+            if cached is not None:
+                self.processes, self.parameters = cached["processes"], cached["parameters"]
+                return
+        self.__init_from_tables(_read_workbook_tables(self.structure_file, sheets))
+        if use_cache:
+            _write_structure_cache(
+                self.structure_file, list(sheets.values()), {"processes": self.processes, "parameters": self.parameters}
+            )
+
+    def __init_from_tables(self, tables: dict[str, Optional[pd.DataFrame]]):
+        """Parses processes and parameters from process, helper (optional) and parameter tables."""
+        processes_raw = tables["process"]
+        if tables["helper"] is not None:
+            processes_raw = pd.concat([processes_raw, tables["helper"]])
+        self.processes = self._init_processes(processes_raw)
+        self.parameters = self._init_parameters(tables["parameter"])
+
+    @staticmethod
+    def _init_processes(processes_raw: pd.DataFrame) -> dict:
+        """Parse (helper) processes with corresponding inputs and outputs to dict.
+
+        Parameters
+        ----------
+        processes_raw: pd.DataFrame
+            Processes (and helper processes) with columns "process", "input" and "output"
 
         Returns
         -------
@@ -179,19 +475,6 @@ class Structure:
             nodes += [node for node in nodes_raw_stripped.split(",") if node != ""]
             return nodes
 
-        processes_raw = pd.read_excel(
-            io=self.structure_file,
-            sheet_name=process_sheet,
-            usecols=("process", "input", "output"),
-        )
-        wb = load_workbook(self.structure_file, read_only=True)
-        if helper_sheet in wb.sheetnames:
-            helpers_raw = pd.read_excel(
-                io=self.structure_file,
-                sheet_name=helper_sheet,
-                usecols=("process", "input", "output"),
-            )
-            processes_raw = pd.concat([processes_raw, helpers_raw])
         processes_raw = processes_raw.fillna("")
         check_character_convention(processes_raw, ["process"])
         processes = processes_raw.to_dict(orient="records")
@@ -200,24 +483,20 @@ class Structure:
             for process in processes
         }
 
-    def _init_parameters(self, parameter_sheet: str) -> dict:
+    @staticmethod
+    def _init_parameters(process_parameter_in_out: pd.DataFrame) -> dict:
         """Parse processes and its parameters with corresponding inputs and outputs to dict.
 
         Parameters
         ----------
-        parameter_sheet: str
-            Sheet to read parameters from
+        process_parameter_in_out: pd.DataFrame
+            Parameters with columns "parameter", "process", "inputs" and "outputs"
 
         Returns
         -------
         dict
             Energy modelling processes, its parameters and inputs and output
         """
-        process_parameter_in_out = pd.read_excel(
-            io=self.structure_file,
-            sheet_name=parameter_sheet,
-            usecols=("parameter", "process", "inputs", "outputs"),
-        )
         process_parameter_in_out = process_parameter_in_out.fillna("")
         check_character_convention(process_parameter_in_out, ["process", "parameter"])
 
@@ -247,111 +526,142 @@ class Structure:
 
         return es_structure
 
+    def get_commodity_incidence(self, categories: Iterable[str] = ("pri", "sec", "iip", "exo", "emi")) -> pd.DataFrame:
+        """Returns incidence of sectors and commodities for given categories (see `get_commodity_incidence`).
+
+        Interface matrix per category can be sliced from incidence using `get_interface_matrix`.
+        """
+        return get_commodity_incidence(self.commodity_graph, categories)
+
     def plot_commodity_interfaces(
         self,
         categories=["pri", "sec", "iip", "exo", "emi"],
         sectors=["pow", "x2x", "ind", "mob", "hea", "helper"],
+        path: Optional[Union[str, pathlib.Path]] = None,
     ):
+        """Plots commodity interfaces of sectors, one matrix per commodity category.
+
+        Each matrix is drawn in a single `pcolormesh` call using a discrete colormap of relation codes.
+
+        Parameters
+        ----------
+        categories: list[str]
+            Commodity categories to plot
+        sectors: list[str]
+            Sectors to plot
+        path: Optional[Union[str, pathlib.Path]]
+            If given, plot is saved to path (format is taken from suffix, i.e. PNG or SVG) without using pyplot,
+            thus, no interactive backend is needed. Otherwise, plot is shown via pyplot.
+
+        Returns
+        -------
+        matplotlib.figure.Figure
+            Figure holding plot
+        """
         try:
-            import matplotlib.pyplot as plt
+            from matplotlib.colors import ListedColormap
+            from matplotlib.figure import Figure
             from matplotlib.patches import Patch
         except ImportError:
             raise ImportError("You must install matplotlib in order to use this functionality.")
 
         cols = len(categories)
-        fig, axes = plt.subplots(nrows=1, ncols=cols, figsize=(cols * 10, 16), sharey=False)
-        if len(categories) == 1:
-            axes = [axes]
-
-        for i, category in enumerate(categories):
-            matrix_data = _process_data(category, sectors, self.processes)
-            ax = axes[i]
-            ax.imshow(matrix_data.values, cmap="RdYlGn", vmin=-1, vmax=1)
-
-            for j in range(len(matrix_data.index)):
-                for k in range(len(matrix_data.columns)):
-                    value = matrix_data.values[j, k]
-                    color = (
-                        "blue"
-                        if value == 2
-                        else "purple"
-                        if value == 3
-                        else "white"
-                        if np.isnan(value)
-                        else "red"
-                        if value == -1
-                        else "green"
-                        if value == 1
-                        else "yellow"
-                    )
-                    rect = plt.Rectangle(
-                        (k - 0.5, j - 0.5), 1, 1, fill=True, facecolor=color, edgecolor="black", linewidth=1
-                    )
-                    ax.add_patch(rect)
-
-            plt.sca(axes[i])
-            ax.set_xticks(range(len(matrix_data.columns)), matrix_data.columns)
-
-            non_nan_not_zero_rows = ((matrix_data.notna()) & (matrix_data != 0) & (matrix_data != 3)).sum(axis=1) == 1
-
-            yticklabels = matrix_data.index.tolist()
-            ax.set_yticks(range(0, len(yticklabels)))
-            for label, bold in zip(ax.get_yticklabels(), non_nan_not_zero_rows):
-                if bold:
-                    label.set_fontweight("bold")  # Set font weight to bold for appropriate labels
+        figsize = (cols * 10, 16)
+        if path is None:
+            import matplotlib.pyplot as plt
 
-            ax.set_yticks(range(len(matrix_data.index)))
-            ax.set_yticklabels(yticklabels)
+            fig = plt.figure(figsize=figsize)
+        else:
+            # Figure is not registered in pyplot, thus, no (interactive) backend is needed
+            fig = Figure(figsize=figsize)
+        axes = fig.subplots(nrows=1, ncols=cols, sharey=False, squeeze=False)[0]
+
+        # Colors and labels per relation code, position in colormap is used as color index
+        relations = [
+            (None, "white", "No Relation"),
+            (INTERFACE_CODES["input"], "red", "Input"),
+            (INTERFACE_CODES["output"], "green", "Output"),
+            (INTERFACE_CODES["input_output"], "yellow", "Input & Output"),
+            (INTERFACE_CODES["source_output"], "purple", "Source & Input/Output"),
+            (INTERFACE_CODES["source"], "blue", "Source Output"),
+        ]
+        cmap = ListedColormap([color for _, color, _ in relations])
+
+        incidence = self.get_commodity_incidence(categories)
+        for ax, category in zip(axes, categories):
+            matrix_data = get_interface_matrix(incidence, category, sectors)
+            values = matrix_data.to_numpy()
+            color_indices = np.zeros(values.shape)
+            for color_index, (code, _, _) in enumerate(relations[1:], start=1):
+                color_indices[values == code] = color_index
+            rows, columns = values.shape
+            ax.pcolormesh(
+                np.arange(columns + 1) - 0.5,
+                np.arange(rows + 1) - 0.5,
+                color_indices,
+                cmap=cmap,
+                vmin=-0.5,
+                vmax=len(relations) - 0.5,
+                edgecolors="black",
+                linewidth=1,
+            )
+            if rows and columns:
+                ax.set_xlim(-0.5, columns - 0.5)
+                ax.set_ylim(rows - 0.5, -0.5)
+                ax.set_aspect("equal")
+
+            ax.set_xticks(range(columns), matrix_data.columns)
+            ax.set_yticks(range(rows), matrix_data.index.tolist())
+            # Commodities related to a single sector only (besides input & output or source relations)
+            single_relation_rows = ((matrix_data.notna()) & (matrix_data != 0) & (matrix_data != 3)).sum(axis=1) == 1
+            for label, bold in zip(ax.get_yticklabels(), single_relation_rows):
+                if bold:
+                    label.set_fontweight("bold")
 
             ax.set_xlabel("Sectors", fontsize=12)
             ax.set_title(category.upper(), fontsize=16)
 
-        legend_elements = [
-            Patch(facecolor="white", edgecolor="black", label="No Relation"),
-            Patch(facecolor="red", edgecolor="black", label="Input"),
-            Patch(facecolor="green", edgecolor="black", label="Output"),
-            Patch(facecolor="yellow", edgecolor="black", label="Input & Output"),
-            Patch(facecolor="purple", edgecolor="black", label="Source & Input/Output"),
-            Patch(facecolor="blue", edgecolor="black", label="Source Output"),
-        ]
+        legend_elements = [Patch(facecolor=color, edgecolor="black", label=label) for _, color, label in relations]
         fig.legend(handles=legend_elements, loc="upper left", fontsize=12)
-        plt.tight_layout()
-        plt.show()
-
-    def get_commodity_diff(self):
+        fig.tight_layout()
+        if path is None:
+            plt.show()
+        else:
+            fig.savefig(path)
+        return fig
+
+    def get_commodity_diff(self) -> dict[str, list[str]]:
         """
         This Function intends to help the user quickly identify missing
         sources or sinks in the Energy system
 
-        input_processes allows the user to set names for processes that are
-        'creating' Commodities
-
-        output_processes allow the user to set names for processes that
-        `destroy` Commodities
+        Returns
+        -------
+        dict[str, list[str]]
+            Sorted commodities which are produced but never consumed ("sink_is_necessary")
+            and commodities which are consumed but never produced ("needed_from_external_source")
         """
+        graph = self.commodity_graph
+        return {
+            "sink_is_necessary": sorted(commodity for commodity in graph.producers if commodity not in graph.consumers),
+            "needed_from_external_source": sorted(
+                commodity for commodity in graph.consumers if commodity not in graph.producers
+            ),
+        }
 
-        def add_value(original_list, adding_list):
-            for item in adding_list:
-                if isinstance(item, list):
-                    original_list.extend(item)
-                else:
-                    original_list.append(item)
-            return original_list
-
-        io_dict = {"inputs": [], "outputs": []}
-
-        for x in self.processes.values():
-            inputs = x["inputs"]
-            outputs = x["outputs"]
-
-            io_dict["inputs"] = add_value(io_dict["inputs"], inputs)
-            io_dict["outputs"] = add_value(io_dict["outputs"], outputs)
+    def get_producers(self, commodity: str) -> list[str]:
+        """Returns processes which output given commodity."""
+        return list(self.commodity_graph.producers.get(commodity, []))
 
-        # delete duplicates
-        io_dict["inputs"] = np.unique(np.array(io_dict["inputs"]))
-        io_dict["outputs"] = np.unique(io_dict["outputs"])
+    def get_consumers(self, commodity: str) -> list[str]:
+        """Returns processes which take given commodity as input."""
+        return list(self.commodity_graph.consumers.get(commodity, []))
 
-        needed_from_external_source = [x for x in io_dict["inputs"] if x not in io_dict["outputs"]]
-        sink_is_necessary = [x for x in io_dict["outputs"] if x not in io_dict["inputs"]]
+    def get_orphan_processes(self) -> list[str]:
+        """Returns processes which are not connected to any commodity."""
+        graph = self.commodity_graph
+        return [process for process in self.processes if not graph.inputs[process] and not graph.outputs[process]]
 
-        return {"sink_is_necessary": sink_is_necessary, "needed_from_external_source": needed_from_external_source}
+    def get_reachable_commodities(self, commodity: str, upstream: bool = False) -> set[str]:
+        """Returns commodities which can be produced from given commodity (or which are needed, if upstream)."""
+        return self.commodity_graph.get_reachable([commodity], upstream=upstream)
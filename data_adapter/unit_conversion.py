@@ -1,3 +1,5 @@
+from typing import Iterable, Optional
+
 from units import NamedComposedUnit, scaled_unit, unit
 from units.exception import IncompatibleUnitsError
 from units.predefined import define_units
@@ -223,7 +225,13 @@ define_units()
 define_energy_model_units()
 
 
-def get_conversion_factor(convert_from, convert_to):
+# Conversion factors by (from, to); errors are cached as well to skip incompatible units without reconverting
+_CONVERSION_FACTORS: dict[tuple[str, str], float | Exception] = {}
+# First convertible target unit and factor by (from, targets)
+_TARGET_CONVERSIONS: dict[tuple[str, tuple[str, ...]], Optional[tuple[str, float]]] = {}
+
+
+def _calculate_conversion_factor(convert_from, convert_to):
     if convert_from not in REGISTRY:
         raise UnitConversionError(f"Unknown unit '{convert_from}'.")
     if convert_to not in REGISTRY:
@@ -232,3 +240,85 @@ def get_conversion_factor(convert_from, convert_to):
         return unit(convert_to)(unit(convert_from)(1)).get_num()
     except IncompatibleUnitsError:
         raise IncompatibleUnitsError(f"Cannot convert from unit '{convert_from}' to unit '{convert_to}'")
+    except (AttributeError, TypeError) as error:
+        # Raised by units library for broken unit definitions
+        raise UnitConversionError(f"Cannot convert from unit '{convert_from}' to unit '{convert_to}': {error}")
+
+
+def get_conversion_factor(convert_from, convert_to):
+    """Returns factor to convert values from one unit into another.
+
+    Factors and failed conversions are cached; use `clear_conversion_cache` if units are defined afterwards.
+
+    Raises
+    ------
+    UnitConversionError
+        if one of the units is unknown
+    IncompatibleUnitsError
+        if units cannot be converted into each other
+    """
+    key = (convert_from, convert_to)
+    if key not in _CONVERSION_FACTORS:
+        try:
+            _CONVERSION_FACTORS[key] = _calculate_conversion_factor(convert_from, convert_to)
+        except (UnitConversionError, IncompatibleUnitsError) as error:
+            _CONVERSION_FACTORS[key] = error
+    factor = _CONVERSION_FACTORS[key]
+    if isinstance(factor, Exception):
+        raise type(factor)(*factor.args)
+    return factor
+
+
+def get_target_conversion(convert_from: str, targets: Iterable[str]) -> Optional[tuple[str, float]]:
+    """Returns first target unit the given unit can be converted into, together with its conversion factor.
+
+    Parameters
+    ----------
+    convert_from: str
+        Unit to convert from
+    targets: Iterable[str]
+        Target units in order of preference
+
+    Returns
+    -------
+    Optional[tuple[str, float]]
+        Target unit and conversion factor, or None if unit cannot be converted into any target unit
+    """
+    key = (convert_from, tuple(targets))
+    if key not in _TARGET_CONVERSIONS:
+        _TARGET_CONVERSIONS[key] = None
+        for target in key[1]:
+            try:
+                _TARGET_CONVERSIONS[key] = (target, get_conversion_factor(convert_from, target))
+            except (UnitConversionError, IncompatibleUnitsError):
+                continue
+            break
+    return _TARGET_CONVERSIONS[key]
+
+
+def get_conversion_table(
+    targets: Iterable[str], units_from: Optional[Iterable[str]] = None
+) -> dict[str, Optional[tuple[str, float]]]:
+    """Precomputes target unit and conversion factor for multiple units.
+
+    Parameters
+    ----------
+    targets: Iterable[str]
+        Target units in order of preference
+    units_from: Optional[Iterable[str]]
+        Units to convert from; defaults to all defined units
+
+    Returns
+    -------
+    dict[str, Optional[tuple[str, float]]]
+        Target unit and conversion factor per unit (None, if unit is not convertible into any target unit)
+    """
+    targets = tuple(targets)
+    units_from = REGISTRY.keys() if units_from is None else units_from
+    return {unit_from: get_target_conversion(unit_from, targets) for unit_from in units_from}
+
+
+def clear_conversion_cache():
+    """Clears cached conversion factors (needed if units are (re)defined after conversions)."""
+    _CONVERSION_FACTORS.clear()
+    _TARGET_CONVERSIONS.clear()
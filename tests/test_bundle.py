@@ -0,0 +1,81 @@
+import json
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data_adapter import bundle, collection, preprocessing
+
+
+@pytest.mark.parametrize("collection_name", ["simple", "test_bandwidth"])
+def test_bundle_equals_processes(tmp_path, monkeypatch, collection_name):
+    adapter = preprocessing.Adapter(collection_name)
+    names = sorted(collection.get_processes_from_collection(collection_name))
+    # Processes are built in worker pool
+    monkeypatch.setattr(preprocessing.Adapter, "iter_processes", lambda *args, **kwargs: pytest.fail("Built serially"))
+    bundle.export_bundle(adapter, tmp_path, names, workers=2)
+    processes = bundle.load_bundle(tmp_path, workers=2)
+    assert list(processes) == names
+    for name, process in processes.items():
+        expected = adapter.get_process(name)
+        assert_frame_equal(process.scalars, expected.scalars)
+        assert_frame_equal(process.timeseries, expected.timeseries)
+        assert process.units == expected.units
+
+
+def test_bundle_with_long_timeseries(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    adapter = preprocessing.Adapter("subprocesses", timeseries_format="long")
+    bundle.export_bundle(adapter, tmp_path, ["wind_onshore"])
+    process = bundle.load_bundle(tmp_path)["wind_onshore"]
+    expected = adapter.get_process("wind_onshore")
+    assert_frame_equal(process.scalars, expected.scalars)
+    assert_frame_equal(process.timeseries, expected.timeseries)
+    # Bundle holds JSON only, no pickled data
+    entry = bundle.read_manifest(tmp_path)["processes"]["wind_onshore"]
+    info = json.loads(pq.read_schema(tmp_path / entry["timeseries"]).metadata[bundle.BUNDLE_METADATA_KEY])
+    assert info["dtypes"][1]["dtype"] == "category"
+
+
+def test_load_selected_processes_from_bundle(tmp_path):
+    adapter = preprocessing.Adapter("subprocesses")
+    bundle.export_bundle(adapter, tmp_path)
+    processes = bundle.load_bundle(tmp_path, ["wind_onshore"])
+    assert list(processes) == ["wind_onshore"]
+    with pytest.raises(KeyError):
+        bundle.load_bundle(tmp_path, ["unknown"])
+
+
+def test_incompatible_bundle(tmp_path):
+    with pytest.raises(bundle.BundleError):
+        bundle.load_bundle(tmp_path)
+    adapter = preprocessing.Adapter("simple")
+    manifest_path = bundle.export_bundle(adapter, tmp_path, ["modex_tech_storage_battery"])
+    manifest = json.loads(manifest_path.read_text())
+    manifest["version"] = 0
+    manifest_path.write_text(json.dumps(manifest))
+    with pytest.raises(bundle.BundleError):
+        bundle.load_bundle(tmp_path)
+
+
+def test_export_replaces_former_bundle(tmp_path, monkeypatch):
+    names = sorted(collection.get_processes_from_collection("simple"))
+    bundle.export_bundle(preprocessing.Adapter("simple"), tmp_path, names)
+
+    # Failing export leaves no valid bundle behind
+    def fail(*args, **kwargs):
+        raise RuntimeError("Export failed")
+
+    monkeypatch.setattr(bundle.collection, "get_collection_meta", fail)
+    with pytest.raises(RuntimeError):
+        bundle.export_bundle(preprocessing.Adapter("simple", units=["GW"]), tmp_path, names)
+    with pytest.raises(bundle.BundleError):
+        bundle.load_bundle(tmp_path)
+    monkeypatch.undo()
+
+    # Files of former larger bundle are removed
+    bundle.export_bundle(preprocessing.Adapter("simple"), tmp_path, names[:1])
+    assert sorted(path.name for path in tmp_path.glob("*.parquet")) == [
+        "00000.scalars.parquet",
+        "00000.timeseries.parquet",
+    ]
+    assert list(bundle.load_bundle(tmp_path)) == names[:1]
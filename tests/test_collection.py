@@ -1,4 +1,9 @@
-from data_adapter import collection
+import json
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data_adapter import collection, settings
 from tests import utils
 
 
@@ -43,3 +48,81 @@ def test_infer_collection_metadata():
     assert "onshore wind farm" in wind_turbine["subjects"]
     assert "Wind Onshore" in wind_turbine["subjects"]
     assert "Wind Offshore" in wind_turbine["subjects"]
+    assert metadata["index"]["names"]["wind_offshore"] == [["modex", "modex_tech_wind_turbine"]]
+    assert metadata["index"]["subjects"]["Wind Offshore"] == [["modex", "modex_tech_wind_turbine"]]
+
+
+def test_build_collection_index():
+    metadata = collection.get_collection_meta("simple")
+    assert "index" not in metadata
+    index = collection.build_collection_index(metadata)
+    assert index["names"]["modex_capacity_factor"] == [["modex", "modex_capacity_factor"]]
+    assert index["subjects"]["battery storage"] == [["modex", "modex_tech_storage_battery"]]
+
+
+def test_collection_meta_cache():
+    collection.clear_collection_meta_cache()
+    collection.get_artifacts_from_collection("simple")
+    collection.get_artifact_from_collection("simple", "modex", "modex_tech_generator_gas")
+    collection.get_processes_from_collection("simple")
+    cache_info = collection.get_collection_meta_cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 2
+    assert cache_info.currsize == 1
+
+
+def test_collection_meta_cache_invalidation(tmp_path, monkeypatch):
+    collection_dir = tmp_path / "cached"
+    collection_dir.mkdir()
+    meta_file = collection_dir / settings.COLLECTION_JSON
+    meta_file.write_text(json.dumps({"version": settings.COLLECTION_META_VERSION, "artifacts": {}}))
+    monkeypatch.setattr(settings, "COLLECTIONS_DIR", tmp_path)
+    collection.clear_collection_meta_cache()
+
+    assert collection.get_processes_from_collection("cached") == set()
+    meta_file.write_text(
+        json.dumps(
+            {
+                "version": settings.COLLECTION_META_VERSION,
+                "artifacts": {
+                    "group": {
+                        "artifact": {"latest_version": "v1", "names": ["process"], "subjects": ["process"]},
+                    },
+                },
+            },
+        ),
+    )
+    assert collection.get_processes_from_collection("cached") == {"process"}
+    assert collection.get_collection_meta_cache_info().misses == 2
+
+
+def test_artifacts_are_interned():
+    artifact = collection.get_artifact_from_collection("simple", "modex", "modex_tech_generator_gas")
+    artifact_from_list = [
+        a for a in collection.get_artifacts_from_collection("simple") if a.artifact == "modex_tech_generator_gas"
+    ][0]
+    assert artifact is artifact_from_list
+    assert artifact.metadata is artifact_from_list.metadata
+    assert artifact.csv_path.name == "modex_tech_generator_gas.csv"
+    assert artifact.json_path.name == "modex_tech_generator_gas.json"
+    assert not hasattr(artifact, "__dict__")
+
+
+@pytest.mark.parametrize("engine", ["frictionless", "pandas"])
+def test_read_artifact_columns(engine):
+    artifact = collection.get_artifact_from_collection(
+        "fk_multiple_versions", "global_emissions", "global_emission_factors"
+    )
+    df = artifact.read(columns=("region", "year", "sec_methane_ch4", "unknown_column"), engine=engine)
+    assert list(df.columns) == ["region", "year", "sec_methane_ch4"]
+    assert df.index.name == "id"
+    assert_frame_equal(df, artifact.read(engine=engine)[["region", "year", "sec_methane_ch4"]])
+
+
+@pytest.mark.parametrize("engine", ["frictionless", "pandas"])
+def test_read_artifact_filters(engine):
+    artifact = collection.get_artifact_from_collection("subprocesses", "modex", "modex_tech_wind_turbine")
+    df = artifact.read(filters={"type": {"wind_offshore", "wind_onshore"}, "region": {"ST", "BE"}}, engine=engine)
+    full_df = artifact.read(engine=engine)
+    assert len(df) == 1
+    assert_frame_equal(df, full_df[full_df["type"] == "wind_offshore"])
@@ -1,8 +1,10 @@
+import pytest
+
+from data_adapter import structure
 from data_adapter.preprocessing import Structure
 
 
 def test_get_commodity_diff():
-
     structure = Structure(
         "SEDOS_Modellstruktur",
         process_sheet="Processes_O1",
@@ -36,3 +38,62 @@ def test_get_commodity_diff():
     }
 
     assert x == commodity_diff
+
+
+def test_commodity_graph():
+    structure = Structure("modex_example")
+    assert structure.get_producers("electricity") == [
+        "battery storage",
+        "energy transformation unit",
+        "onshore wind farm",
+        "additional",
+    ]
+    assert structure.get_consumers("ch4") == ["energy transformation unit"]
+    assert structure.get_consumers("unknown") == []
+    assert structure.commodity_graph.outputs["energy transformation unit"] == ["electricity", "heat", "co2"]
+    assert structure.get_reachable_commodities("ch4") == {"electricity", "heat", "co2"}
+    assert structure.get_reachable_commodities("electricity", upstream=True) == {"electricity", "ch4", "onshore"}
+    assert structure.get_orphan_processes() == []
+    assert structure.get_commodity_diff() == {
+        "sink_is_necessary": ["co2", "heat"],
+        "needed_from_external_source": ["ch4", "onshore"],
+    }
+
+
+def test_interface_matrix():
+    processes = {
+        "pow_source_wind": {"inputs": [], "outputs": ["sec_elec"]},
+        "pow_gas_plant": {"inputs": ["pri_gas"], "outputs": [["sec_elec", "sec_heat"], "emi_co2"]},
+        "hea_heat_pump": {"inputs": ["sec_elec", "sec_heat"], "outputs": ["sec_heat"]},
+        "pow_storage_battery": {"inputs": ["sec_elec"], "outputs": ["sec_elec"]},
+    }
+    incidence = structure.get_commodity_incidence(structure.CommodityGraph.from_processes(processes), ["sec", "pri"])
+    assert len(incidence) == 5
+    matrix = structure.get_interface_matrix(incidence, "sec", ["pow", "hea", "ind"])
+    assert list(matrix.index) == ["sec_elec", "sec_heat"]
+    assert list(matrix.columns) == ["pow", "hea", "ind"]
+    assert matrix.loc["sec_elec", "pow"] == 3
+    assert matrix.loc["sec_heat", "pow"] == 1
+    assert matrix.loc["sec_elec", "hea"] == -1
+    assert matrix.loc["sec_heat", "hea"] == 0
+    assert matrix["ind"].isna().all()
+    matrix = structure.get_interface_matrix(incidence, "pri", ["pow", "hea"])
+    assert matrix.loc["pri_gas"].tolist()[0] == -1
+    assert structure.get_interface_matrix(incidence, "emi", ["pow"]).empty
+
+
+@pytest.mark.parametrize("suffix", ["png", "svg"])
+def test_plot_commodity_interfaces_to_file(tmp_path, suffix):
+    pytest.importorskip("matplotlib")
+    path = tmp_path / f"interfaces.{suffix}"
+    structure = Structure(
+        "SEDOS_Modellstruktur",
+        process_sheet="Processes_O1",
+        parameter_sheet="Parameter_O1",
+        helper_sheet="Helper_O1",
+    )
+    fig = structure.plot_commodity_interfaces(categories=["sec", "emi"], path=path)
+    assert path.stat().st_size > 0
+    # Single mesh per category instead of one patch per cell
+    assert [len(ax.collections) for ax in fig.axes] == [1, 1]
+    assert [len(ax.patches) for ax in fig.axes] == [0, 0]
@@ -1,4 +1,8 @@
+import asyncio
+import itertools
 import logging
+import pickle
+import threading
 
 import pandas
 import pytest
@@ -88,6 +92,161 @@ def test_process_with_multiple_artifacts_for_process_with_annotations():
     assert len(artifacts.scalars) == 51
 
 
+def test_get_processes():
+    adapter = preprocessing.Adapter("subprocesses")
+    processes = adapter.get_processes(["wind_offshore", "wind_onshore"])
+    assert list(processes) == ["wind_offshore", "wind_onshore"]
+    for name, process in processes.items():
+        expected = adapter.get_process(name)
+        assert_frame_equal(process.scalars, expected.scalars)
+        assert_frame_equal(process.timeseries, expected.timeseries)
+        assert process.units == expected.units
+
+
+def test_get_processes_reads_artifacts_once(monkeypatch):
+    reads = []
+    read = collection.Artifact.read
+
+    def count_reads(artifact, *args, **kwargs):
+        reads.append(artifact)
+        return read(artifact, *args, **kwargs)
+
+    monkeypatch.setattr(collection.Artifact, "read", count_reads)
+    adapter = preprocessing.Adapter("subprocesses")
+    adapter.get_processes(["wind_offshore", "wind_onshore"])
+    assert len(reads) == len(set(reads))
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_processes(monkeypatch, prefetch):
+    reads = []
+    read = collection.Artifact.read
+
+    def count_reads(artifact, *args, **kwargs):
+        # Planning reads foreign key columns only
+        if kwargs.get("columns") is None:
+            reads.append(artifact)
+        return read(artifact, *args, **kwargs)
+
+    adapter = preprocessing.Adapter("subprocesses")
+    expected = {name: adapter.get_process(name) for name in ["wind_offshore", "wind_onshore"]}
+    monkeypatch.setattr(collection.Artifact, "read", count_reads)
+    processes = dict(adapter.iter_processes(["wind_onshore", "wind_offshore"], prefetch=prefetch))
+    assert len(reads) == len(set(reads))
+    assert sorted(processes) == sorted(expected)
+    for name, process in processes.items():
+        assert_frame_equal(process.scalars, expected[name].scalars)
+        assert_frame_equal(process.timeseries, expected[name].timeseries)
+
+
+def test_iter_processes_releases_frames(monkeypatch):
+    kept = []
+    release = preprocessing._ArtifactFrames.release
+
+    def record_release(frames, keep=()):
+        kept.append(set(keep))
+        return release(frames, keep)
+
+    monkeypatch.setattr(preprocessing._ArtifactFrames, "release", record_release)
+    adapter = preprocessing.Adapter("simple", units=["MW"])
+    names = list(dict(adapter.iter_processes()))
+    assert sorted(names) == sorted(collection.get_processes_from_collection("simple"))
+    assert len(kept) == len(names)
+    assert kept[-1] == set()
+
+
+def test_iter_processes_keeps_foreign_key_targets(monkeypatch):
+    reads = []
+    read = collection.Artifact.read
+
+    def count_reads(artifact, *args, **kwargs):
+        if kwargs.get("columns") is None:
+            reads.append(artifact.artifact)
+        return read(artifact, *args, **kwargs)
+
+    adapter = preprocessing.Adapter("simple", foreign_key_cache_size=0)
+    names = ["modex_tech_storage_battery", "modex_tech_generator_gas", "modex_tech_wind_turbine_onshore"]
+    expected = {name: adapter.get_process(name) for name in names}
+    monkeypatch.setattr(collection.Artifact, "read", count_reads)
+    processes = dict(adapter.iter_processes(names))
+    # Foreign key targets are read only once, although foreign key cache is disabled
+    assert len(reads) == len(set(reads))
+    assert "modex_constraint" in reads
+    for name, process in processes.items():
+        assert_frame_equal(process.scalars, expected[name].scalars)
+        assert_frame_equal(process.timeseries, expected[name].timeseries)
+
+
+def test_get_processes_with_unknown_process():
+    adapter = preprocessing.Adapter("subprocesses")
+    with pytest.raises(KeyError):
+        adapter.get_processes(["wind_onshore", "unknown"])
+
+
+def test_get_processes_with_workers():
+    adapter = preprocessing.Adapter("simple", units=["MW"])
+    names = sorted(collection.get_processes_from_collection("simple"), reverse=True)
+    processes = adapter.get_processes(names, workers=2)
+    assert list(processes) == names
+    for name, process in processes.items():
+        expected = adapter.get_process(name)
+        assert_frame_equal(process.scalars, expected.scalars)
+        assert_frame_equal(process.timeseries, expected.timeseries)
+        assert process.units == expected.units
+
+
+def test_chunks_keep_processes_sharing_artifacts_together():
+    names = sorted(collection.get_processes_from_collection("subprocesses"))
+    plan = {name: collection.get_artifacts_from_collection("subprocesses", name) for name in names}
+    chunks = preprocessing.Adapter._Adapter__get_chunks(plan, len(names))
+    assert sorted(itertools.chain.from_iterable(chunks)) == names
+    assert len(chunks) > 1
+    for chunk, other_chunk in itertools.combinations(chunks, 2):
+        artifacts = {artifact for process in chunk for artifact in plan[process]}
+        assert not artifacts.intersection(artifact for process in other_chunk for artifact in plan[process])
+
+
+def test_get_processes_with_workers_names_failing_process():
+    adapter = preprocessing.Adapter("fk_multiple_versions")
+    with pytest.raises(preprocessing.PreprocessingError, match="ind_steel_boiler_0") as error:
+        adapter.get_processes(["ind_steel_casting_0", "ind_steel_boiler_0", "excess_co2"], workers=2)
+    assert isinstance(error.value.__cause__, FileNotFoundError)
+
+
+def test_aget_processes():
+    adapter = preprocessing.Adapter("subprocesses")
+    names = ["wind_onshore", "modex_tech_storage_battery", "wind_offshore"]
+    processes = asyncio.run(adapter.aget_processes(names, concurrency=2))
+    assert list(processes) == names
+    for name, process in processes.items():
+        expected = adapter.get_process(name)
+        assert_frame_equal(process.scalars, expected.scalars)
+        assert_frame_equal(process.timeseries, expected.timeseries)
+
+
+def test_aget_processes_plans_in_executor(monkeypatch):
+    threads = []
+    get_artifacts = collection.get_artifacts_from_collection
+
+    def record_thread(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return get_artifacts(*args, **kwargs)
+
+    monkeypatch.setattr(collection, "get_artifacts_from_collection", record_thread)
+    adapter = preprocessing.Adapter("subprocesses")
+    asyncio.run(adapter.aget_processes(["wind_onshore", "wind_offshore"]))
+    assert threads
+    assert threading.main_thread() not in threads
+
+
+def test_aget_process():
+    adapter = preprocessing.Adapter("subprocesses")
+    process = asyncio.run(adapter.aget_process("wind_onshore"))
+    assert_frame_equal(process.scalars, adapter.get_process("wind_onshore").scalars)
+    with pytest.raises(KeyError):
+        asyncio.run(adapter.aget_process("unknown"))
+
+
 def test_filter_df():
     data = {c: [c] for c in core.SCALAR_COLUMNS}
     data["a"] = [3]
@@ -178,6 +337,23 @@ def test_duplicate_values_in_merge_regions():
         adapter._Adapter__merge_parameters(df.explode("region"), datatype=collection.DataType.Scalar)
 
 
+def test_conflicting_values_in_merge_regions():
+    df = pandas.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "region": ["a", "a", "b", "b"],
+            "year": [1, 1, 1, 1],
+            "value1": [10.0, 0.0, 3.0, 4.0],
+            "method": [{}, {}, {}, {}],
+        },
+    )
+    adapter = preprocessing.Adapter(None)
+    with pytest.raises(
+        preprocessing.PreprocessingError, match=r"Multiple values defined for column='value1': \(4.0, 3.0\)"
+    ):
+        adapter._Adapter__merge_parameters(df, datatype=collection.DataType.Scalar)
+
+
 def test_refactor_timeseries():
     adapter = preprocessing.Adapter("refactor_timeseries")
     artifact = adapter.get_process("modex_capacity_factor")
@@ -185,6 +361,78 @@ def test_refactor_timeseries():
     assert len(artifact.timeseries.columns) == 16
 
 
+def test_refactor_timeseries_with_multiple_periods():
+    periods = [("2020-01-01 00:00", "2020-01-01 02:00"), ("2020-01-01 03:00", "2020-01-01 05:00")]
+    df = pandas.DataFrame(
+        {
+            "region": [("a",), ("a",), ("b",), ("b",)],
+            "timeindex_start": [pandas.Timestamp(start) for start, _ in periods * 2],
+            "timeindex_stop": [pandas.Timestamp(stop) for _, stop in periods * 2],
+            "timeindex_resolution": ["1h"] * 4,
+            "value": [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0], None],
+        }
+    )
+    adapter = preprocessing.Adapter(None)
+    timeseries = adapter._Adapter__refactor_timeseries(df)
+    assert list(timeseries.columns) == [("value", ("a",)), ("value", ("b",))]
+    assert timeseries.columns.names == ["name", "region"]
+    assert_series_equal(
+        timeseries.index.to_series(),
+        pandas.date_range("2020-01-01 00:00", "2020-01-01 05:00", freq="1h").to_series(),
+        check_freq=False,
+    )
+    assert timeseries["value", ("a",)].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    assert timeseries["value", ("b",)].tolist()[:3] == [7.0, 8.0, 9.0]
+    assert timeseries["value", ("b",)].isna().sum() == 3
+
+
+def test_long_timeseries():
+    periods = [("2020-01-01 00:00", "2020-01-01 02:00"), ("2020-01-01 03:00", "2020-01-01 05:00")]
+    df = pandas.DataFrame(
+        {
+            "region": [("a",), ("a",), ("b",)],
+            "timeindex_start": [pandas.Timestamp(start) for start, _ in periods + periods[:1]],
+            "timeindex_stop": [pandas.Timestamp(stop) for _, stop in periods + periods[:1]],
+            "timeindex_resolution": ["1h"] * 3,
+            "value": [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]],
+        }
+    )
+    adapter = preprocessing.Adapter(None, timeseries_format="long")
+    timeseries = adapter._Adapter__refactor_timeseries(df)
+    assert list(timeseries.columns) == ["timestamp", "name", "region", "value"]
+    assert len(timeseries) == 9
+    assert timeseries["name"].dtype == "category"
+    assert timeseries["region"].dtype == "category"
+    assert timeseries["region"].tolist() == [("a",)] * 6 + [("b",)] * 3
+    assert timeseries["value"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+    assert timeseries["timestamp"].iloc[6] == pandas.Timestamp("2020-01-01 00:00")
+
+
+def test_empty_long_timeseries():
+    adapter = preprocessing.Adapter(None, timeseries_format="long")
+    timeseries = adapter._Adapter__refactor_timeseries(pandas.DataFrame())
+    assert list(timeseries.columns) == ["timestamp", "name", "region", "value"]
+    assert timeseries.empty
+    assert timeseries["timestamp"].dtype == "datetime64[ns]"
+    assert timeseries["name"].dtype == "category"
+    assert timeseries["region"].dtype == "category"
+    assert timeseries["value"].dtype == "float64"
+
+
+def test_long_timeseries_equals_wide_timeseries():
+    wide = preprocessing.Adapter("simple").get_process("modex_tech_wind_turbine_onshore").timeseries
+    adapter = preprocessing.Adapter("simple", timeseries_format="long")
+    long = adapter.get_process("modex_tech_wind_turbine_onshore").timeseries
+    pivoted = long.pivot(index="timestamp", columns=["name", "region"], values="value")
+    pivoted.columns = pandas.MultiIndex.from_tuples(pivoted.columns.tolist(), names=["name", "region"])
+    assert_frame_equal(pivoted[wide.columns], wide, check_names=False, check_freq=False)
+
+
+def test_unknown_timeseries_format():
+    with pytest.raises(ValueError):
+        preprocessing.Adapter("simple", timeseries_format="tidy")
+
+
 def test_unit_conversion_in_scalar_data():
     adapter = preprocessing.Adapter("simple", units=["GW"])
     artifact = adapter.get_process("modex_tech_wind_turbine_onshore")
@@ -199,6 +447,17 @@ def test_unit_conversion_in_timeseries_data():
     assert artifact.timeseries[("onshore", ("HE",))].iloc[0] == pytest.approx(0.032336 / 1000, rel=1e-3)
 
 
+def test_convert_arrays_is_identical_to_item_wise_conversion():
+    adapter = preprocessing.Adapter("simple")
+    factor = 0.001
+    same_length = pandas.Series([[0.1, 2, 3.3], [4.7, 5.1, 6.0], None])
+    ragged = pandas.Series([[0.1, 2], [4.7, 5.1, 6.0], []])
+    for series in (same_length, ragged):
+        converted = adapter._Adapter__convert_arrays(series, factor)
+        expected = [[item * factor for item in cell] if isinstance(cell, list) else cell for cell in series]
+        assert converted.tolist() == expected
+
+
 def test_fks_with_multiple_versions():
     adapter = preprocessing.Adapter("fk_multiple_versions")
     artifact = adapter.get_process("ind_steel_casting_0")
@@ -206,6 +465,66 @@ def test_fks_with_multiple_versions():
     assert artifact.scalars["emissions_factor_sec_methane_co2"][0] == 28
 
 
+def test_foreign_key_cache():
+    adapter = preprocessing.Adapter("fk_multiple_versions")
+    process = adapter.get_process("ind_steel_casting_0")
+    # All foreign parameters of global emission factors are read at once
+    assert adapter.get_foreign_key_cache_info() == core.CacheInfo(hits=2, misses=1, currsize=3)
+    cached_process = adapter.get_process("ind_steel_casting_0")
+    assert adapter.get_foreign_key_cache_info() == core.CacheInfo(hits=5, misses=1, currsize=3)
+    assert_frame_equal(process.scalars, cached_process.scalars)
+
+    adapter.clear_foreign_key_cache()
+    assert adapter.get_foreign_key_cache_info() == core.CacheInfo(hits=0, misses=0, currsize=0)
+
+
+def test_adapter_can_be_pickled():
+    adapter = preprocessing.Adapter("fk_multiple_versions", units=["MWh"], foreign_key_cache_size=2)
+    process = adapter.get_process("ind_steel_casting_0")
+    unpickled = pickle.loads(pickle.dumps(adapter))
+    assert unpickled.units == ["MWh"]
+    assert unpickled.foreign_key_cache_size == 2
+    assert unpickled.get_foreign_key_cache_info() == core.CacheInfo(0, 0, 0)
+    assert_frame_equal(unpickled.get_process("ind_steel_casting_0").scalars, process.scalars)
+
+
+def test_foreign_key_cache_size():
+    adapter = preprocessing.Adapter("fk_multiple_versions", foreign_key_cache_size=1)
+    adapter.get_process("ind_steel_casting_0")
+    assert adapter.get_foreign_key_cache_info().currsize == 1
+
+    adapter = preprocessing.Adapter("fk_multiple_versions", foreign_key_cache_size=0)
+    process = adapter.get_process("ind_steel_casting_0")
+    assert adapter.get_foreign_key_cache_info() == core.CacheInfo(hits=0, misses=3, currsize=0)
+    assert_frame_equal(
+        process.scalars, preprocessing.Adapter("fk_multiple_versions").get_process("ind_steel_casting_0").scalars
+    )
+
+
+def test_fk_candidates_from_schema():
+    df = pandas.DataFrame(
+        {
+            "region": ["BB", "BE"],
+            "wacc": ["global_scalars.wacc", None],
+            "lifetime": ["global_scalars.lifetime"] * 2,
+            "comment_fk": [None, None],
+            "name": ["no_fk", "no_fk"],
+            "comment": ["a.b", "a.b"],
+        }
+    )
+    fields = [
+        {"name": "region", "type": "text"},
+        {"name": "wacc", "type": "text"},
+        {"name": "lifetime", "type": "integer"},
+        {"name": "comment_fk", "type": "text"},
+        {"name": "name", "type": "text"},
+        {"name": "comment", "type": "text"},
+    ]
+    metadata = {"resources": [{"schema": {"fields": fields}}]}
+    foreign_keys = preprocessing.Adapter._get_foreign_keys("process", df, metadata)
+    assert foreign_keys == {"wacc": preprocessing.ForeignKey("global_scalars", "wacc")}
+
+
 def test_fks_with_none_type():
     adapter = preprocessing.Adapter("process_type_none")
     artifact = adapter.get_process("ind_steel_casting_0")
@@ -228,6 +547,21 @@ def test_bandwidth_unpacking():
     )
 
 
+def test_unpack_bandwidths_only_in_bandwidth_columns():
+    df = pandas.DataFrame(
+        {
+            "a": [[1.0, 2.0], [3.0], [], [5.0]],
+            "b": [[1.0], [2.0], [3.0], [4.0]],
+            "bandwidth_type": [{"a": "value"}, {"a": "value", "b": "value"}, {"a": "value"}, None],
+        },
+        index=[0, 0, 1, 2],
+    )
+    adapter = preprocessing.Adapter("test_bandwidth")
+    unpacked = adapter._Adapter__unpack_bandwidths(df)
+    assert unpacked["a"].tolist() == [1.0, 3.0, None, [5.0]]
+    assert unpacked["b"].tolist() == [[1.0], 2.0, [3.0], [4.0]]
+
+
 def test_return_only_relevant_columns():
     adapter = preprocessing.Adapter("test_return_only_relevant_columns")
 
@@ -0,0 +1,223 @@
+import concurrent.futures
+import json
+import shutil
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data_adapter import collection, preprocessing, readers, settings
+
+
+def get_artifacts():
+    for collection_name in ("simple", "subprocesses", "process_type_none", "test_bandwidth"):
+        # Test collections do not hold all artifacts listed in collection metadata
+        yield from (
+            artifact for artifact in collection.get_artifacts_from_collection(collection_name) if artifact.path.exists()
+        )
+
+
+@pytest.mark.parametrize("artifact", list(get_artifacts()), ids=lambda artifact: artifact.artifact)
+def test_pandas_reader_equals_frictionless_reader(artifact):
+    assert_frame_equal(artifact.read(engine="pandas"), artifact.read(engine="frictionless"))
+
+
+def test_pandas_reader_sets_invalid_cells_to_none(tmp_path):
+    metadata = {
+        "name": "invalid",
+        "resources": [
+            {
+                "schema": {
+                    "fields": [
+                        {"name": "id", "type": "bigint"},
+                        {"name": "year", "type": "int"},
+                        {"name": "value", "type": "float"},
+                        {"name": "values", "type": "float array"},
+                        {"name": "comment", "type": "json"},
+                        {"name": "timestamp", "type": "timestamp"},
+                        {"name": "date", "type": "timestamp"},
+                    ],
+                    "primaryKey": ["id"],
+                },
+            },
+        ],
+    }
+    csv_file = tmp_path / "invalid.csv"
+    csv_file.write_text(
+        '"id","year","value","values","comment","timestamp","date"\n'
+        '1,2020,"3,6","[1.0, 2.0]","{""a"": ""b""}",2016-01-01T00:00:00,2016-01-01\n'
+        '2,,1.5,"[1.0, 2.0], [3.0]","[]",2016-01-01,2016-01-01T00:00\n'
+        "3,2030,,,,,\n",
+    )
+    df = readers.read_csv_with_pandas(csv_file, metadata)
+    assert_frame_equal(df, readers.read_csv_with_frictionless(csv_file, metadata))
+    assert str(df["year"].dtype) == "Int64"
+    assert df["values"].tolist() == [[1.0, 2.0], None, None]
+    assert df["comment"].tolist() == [{"a": "b"}, None, None]
+    assert json.dumps(df.loc[1, "value"]) == "NaN"
+    # Dates without time are no valid datetimes
+    assert df["timestamp"].isna().tolist() == [False, True, True]
+    assert df["date"].dtype == object
+    assert df["date"].isna().all()
+
+
+def test_pandas_reader_falls_back_to_frictionless_for_unsupported_types(tmp_path):
+    metadata = {
+        "name": "unsupported",
+        "resources": [
+            {
+                "schema": {
+                    "fields": [
+                        {"name": "id", "type": "bigint"},
+                        {"name": "active", "type": "boolean"},
+                        {"name": "day", "type": "date"},
+                        {"name": "value", "type": "float"},
+                    ],
+                    "primaryKey": ["id"],
+                },
+            },
+        ],
+    }
+    csv_file = tmp_path / "unsupported.csv"
+    csv_file.write_text('"id","active","day","value"\n1,true,2020-01-01,1.5\n2,false,2030-12-31,\n')
+    df = readers.read_csv_with_pandas(csv_file, metadata)
+    assert_frame_equal(df, readers.read_csv_with_frictionless(csv_file, metadata))
+    assert df["active"].tolist() == [True, False]
+    filtered_df = readers.read_csv_with_pandas(csv_file, metadata, filters={"active": [False]})
+    assert filtered_df.index.tolist() == [2]
+
+
+def test_unknown_reader():
+    artifact = collection.get_artifact_from_collection("simple", "modex", "modex_tech_generator_gas")
+    with pytest.raises(readers.ReaderError):
+        artifact.read(engine="unknown")
+
+
+def test_artifact_cache(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    shutil.copytree(settings.COLLECTIONS_DIR / "subprocesses", tmp_path / "subprocesses")
+    monkeypatch.setattr(settings, "COLLECTIONS_DIR", tmp_path)
+    for artifact in collection.get_artifacts_from_collection("subprocesses"):
+        df = artifact.read(use_cache=True)
+        cache_files = list(artifact.path.glob("*.parquet"))
+        assert len(cache_files) == 1
+        file_hash = readers.get_file_hash(artifact.csv_path)
+        assert cache_files[0].name == f"{artifact.artifact}.{file_hash}.{settings.CSV_ENGINE}.parquet"
+        cached_df = artifact.read(use_cache=True)
+        assert_frame_equal(cached_df, df)
+
+    timeseries = collection.get_artifact_from_collection("subprocesses", "modex", "modex_capacity_factor")
+    cached_df = readers.read_cache(timeseries.csv_path, timeseries.metadata, engine=settings.CSV_ENGINE)
+    assert isinstance(cached_df["onshore"].iloc[0], list)
+    assert isinstance(cached_df["method"].iloc[0], dict)
+    projected_df = timeseries.read(columns=("region", "onshore", "method"), use_cache=True)
+    assert_frame_equal(projected_df, cached_df[["region", "method", "onshore"]])
+
+
+def test_artifact_cache_keeps_item_types(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    shutil.copytree(settings.COLLECTIONS_DIR / "subprocesses", tmp_path / "subprocesses")
+    monkeypatch.setattr(settings, "COLLECTIONS_DIR", tmp_path)
+    expected = preprocessing.Adapter("subprocesses").get_process("wind_onshore")
+    monkeypatch.setattr(settings, "USE_ARTIFACT_CACHE", True)
+    for _ in range(2):  # Write and read cache
+        collection.clear_artifact_cache()
+        process = preprocessing.Adapter("subprocesses").get_process("wind_onshore")
+        assert process.timeseries.dtypes.tolist() == expected.timeseries.dtypes.tolist()
+        assert_frame_equal(process.timeseries, expected.timeseries)
+
+    artifact = collection.get_artifact_from_collection("subprocesses", "modex", "modex_capacity_factor")
+    cached_df = artifact.read(use_cache=True)
+    assert [type(item) for item in cached_df["onshore"].iloc[0]] == [
+        type(item) for item in artifact.read()["onshore"].iloc[0]
+    ]
+
+
+def test_artifact_cache_is_kept_per_engine(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    shutil.copytree(settings.COLLECTIONS_DIR / "simple", tmp_path / "simple")
+    monkeypatch.setattr(settings, "COLLECTIONS_DIR", tmp_path)
+    artifact = collection.get_artifact_from_collection("simple", "modex", "modex_tech_generator_gas")
+    artifact.read(engine="pandas", use_cache=True)
+    assert readers.read_cache(artifact.csv_path, artifact.metadata, engine="frictionless") is None
+    artifact.read(engine="frictionless", use_cache=True)
+    assert len(list(artifact.path.glob("*.parquet"))) == 2
+
+
+def test_unreadable_artifact_cache_is_a_miss(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    shutil.copytree(settings.COLLECTIONS_DIR / "simple", tmp_path / "simple")
+    monkeypatch.setattr(settings, "COLLECTIONS_DIR", tmp_path)
+    artifact = collection.get_artifact_from_collection("simple", "modex", "modex_tech_generator_gas")
+    cache_path = readers.get_cache_path(artifact.csv_path, settings.CSV_ENGINE)
+    cache_path.write_bytes(b"")
+    assert readers.read_cache(artifact.csv_path, artifact.metadata, engine=settings.CSV_ENGINE) is None
+    assert_frame_equal(artifact.read(use_cache=True), artifact.read())
+    assert readers.read_cache(artifact.csv_path, artifact.metadata, engine=settings.CSV_ENGINE) is not None
+
+
+def test_concurrent_artifact_cache_writers(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    shutil.copytree(settings.COLLECTIONS_DIR / "simple", tmp_path / "simple")
+    monkeypatch.setattr(settings, "COLLECTIONS_DIR", tmp_path)
+    artifact = collection.get_artifact_from_collection("simple", "modex", "modex_tech_generator_gas")
+    df = artifact.read()
+
+    def write_and_read(_):
+        readers.write_cache(artifact.csv_path, artifact.metadata, df)
+        cached_df = readers.read_cache(artifact.csv_path, artifact.metadata)
+        assert cached_df is None or cached_df.shape == df.shape
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write_and_read, range(40)))
+    assert [path.name for path in artifact.path.glob("*.tmp")] == []
+    assert_frame_equal(readers.read_cache(artifact.csv_path, artifact.metadata), df)
+
+
+def test_artifact_cache_is_renewed_if_source_changes(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    shutil.copytree(settings.COLLECTIONS_DIR / "simple", tmp_path / "simple")
+    monkeypatch.setattr(settings, "COLLECTIONS_DIR", tmp_path)
+    artifact = collection.get_artifact_from_collection("simple", "modex", "modex_tech_generator_gas")
+    artifact.read(use_cache=True)
+    outdated_cache_file = list(artifact.path.glob("*.parquet"))[0]
+
+    # Change source file without changing its data
+    csv_content = artifact.csv_path.read_text(encoding="utf-8")
+    artifact.csv_path.write_text(csv_content.replace('"id"', "id", 1), encoding="utf-8")
+    artifact.read(use_cache=True)
+    cache_files = list(artifact.path.glob("*.parquet"))
+    assert len(cache_files) == 1
+    assert cache_files[0] != outdated_cache_file
+
+
+def test_filters_with_missing_values(tmp_path):
+    metadata = {
+        "name": "types",
+        "resources": [
+            {
+                "schema": {
+                    "fields": [
+                        {"name": "id", "type": "bigint"},
+                        {"name": "type", "type": "text"},
+                        {"name": "region", "type": "text array"},
+                        {"name": "value", "type": "float"},
+                    ],
+                    "primaryKey": ["id"],
+                },
+            },
+        ],
+    }
+    csv_file = tmp_path / "types.csv"
+    csv_file.write_text(
+        '"id","type","region","value"\n'
+        '1,"a","[""BB"", ""BE""]",1.0\n'
+        '2,,"[""BB""]",2.0\n'
+        '3,"b","[""BE""]",3.0\n'
+        "4,,,4.0\n",
+    )
+    filters = {"type": {"a", None}, "region": {"BE", None}}
+    df = readers.read_csv_with_pandas(csv_file, metadata, filters=filters)
+    assert df.index.tolist() == [1, 4]
+    assert_frame_equal(df, readers.read_csv_with_frictionless(csv_file, metadata, filters=filters))
+    empty_df = readers.read_csv_with_pandas(csv_file, metadata, columns=["value"], filters={"type": {"c"}})
+    assert_frame_equal(empty_df, readers.read_csv_with_frictionless(csv_file, metadata, ["value"], {"type": {"c"}}))
@@ -1,7 +1,11 @@
 import json
 import pathlib
+import shutil
 
-from data_adapter import structure
+import pandas
+import pytest
+
+from data_adapter import settings, structure
 
 
 def test_parameters():
@@ -19,3 +23,95 @@ def test_processes():
     st = structure.Structure("modex_example")
     assert len(st.processes) == 4
     assert st.processes["energy transformation unit"]["outputs"] == [["electricity", "heat"], "co2"]
+
+
+def test_structure_cache(tmp_path, monkeypatch):
+    structure_file = pathlib.Path(__file__).parent / "test_data" / "test_structures" / "modex_example.xlsx"
+    shutil.copy(structure_file, tmp_path)
+    monkeypatch.setattr(settings, "STRUCTURES_DIR", tmp_path)
+    expected = structure.Structure("modex_example")
+    st = structure.Structure("modex_example", use_cache=True)
+    cache_path = structure.get_structure_cache_path(tmp_path / "modex_example.xlsx")
+    assert cache_path.exists()
+    assert st.processes == expected.processes
+    assert st.parameters == expected.parameters
+
+    # Workbook is not opened again if cache exists
+    def fail(*args, **kwargs):
+        raise AssertionError("Workbook should not be read")
+
+    monkeypatch.setattr(structure.pd, "ExcelFile", fail)
+    cached = structure.Structure("modex_example", use_cache=True)
+    assert cached.processes == expected.processes
+    assert cached.parameters == expected.parameters
+    with pytest.raises(AssertionError):
+        structure.Structure("modex_example", process_sheet="Processes_O1", use_cache=True)
+
+
+@pytest.mark.parametrize("table_format", ["csv", "json", "parquet"])
+def test_structure_from_tables(tmp_path, monkeypatch, table_format):
+    structure_file = pathlib.Path(__file__).parent / "test_data" / "test_structures" / "modex_example.xlsx"
+    shutil.copy(structure_file, tmp_path)
+    monkeypatch.setattr(settings, "STRUCTURES_DIR", tmp_path)
+    expected = structure.Structure("modex_example")
+    structure_dir = structure.export_structure("modex_example", table_format)
+    assert (structure_dir / f"Process_Set.{table_format}").exists()
+    (tmp_path / "modex_example.xlsx").unlink()
+    st = structure.Structure("modex_example")
+    assert st.structure_source == structure_dir
+    assert st.structure_file == tmp_path / "modex_example.xlsx"
+    assert st.processes == expected.processes
+    assert st.processes["energy transformation unit"]["outputs"] == [["electricity", "heat"], "co2"]
+    assert st.parameters == expected.parameters
+
+    # Tables of empty sheets keep their columns
+    sheets = {"process_sheet": "Processes_O1", "parameter_sheet": "Parameter_O1", "helper_sheet": "Helper_O1"}
+    structure_file = structure_file.with_name("SEDOS_Modellstruktur.xlsx")
+    shutil.copy(structure_file, tmp_path)
+    expected = structure.Structure("SEDOS_Modellstruktur", **sheets)
+    assert not expected.parameters
+    structure.export_structure("SEDOS_Modellstruktur", table_format, **sheets)
+    (tmp_path / "SEDOS_Modellstruktur.xlsx").unlink()
+    st = structure.Structure("SEDOS_Modellstruktur", **sheets)
+    assert st.processes == expected.processes
+    assert st.parameters == expected.parameters
+
+
+def test_structure_from_incomplete_tables(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STRUCTURES_DIR", tmp_path)
+    (tmp_path / "incomplete").mkdir()
+    with pytest.raises(FileNotFoundError):
+        structure.Structure("incomplete")
+
+
+def test_outdated_structure_tables(tmp_path, monkeypatch, caplog):
+    structure_file = pathlib.Path(__file__).parent / "test_data" / "test_structures" / "modex_example.xlsx"
+    shutil.copy(structure_file, tmp_path)
+    monkeypatch.setattr(settings, "STRUCTURES_DIR", tmp_path)
+    structure_dir = structure.export_structure("modex_example")
+    assert structure.Structure("modex_example").structure_source == structure_dir
+
+    # Changed workbook is preferred over tables exported from former workbook
+    (tmp_path / "modex_example.xlsx").write_bytes(structure_file.read_bytes() + b"\0")
+    st = structure.Structure("modex_example")
+    assert st.structure_source == st.structure_file == tmp_path / "modex_example.xlsx"
+    assert "outdated" in caplog.text
+
+
+@pytest.mark.parametrize("table_format", ["csv", "json", "parquet"])
+def test_structure_table_with_missing_columns(tmp_path, monkeypatch, table_format):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(settings, "STRUCTURES_DIR", tmp_path)
+    structure_dir = tmp_path / "incomplete"
+    structure_dir.mkdir()
+    table = pandas.DataFrame({"process": ["a"], "input": ["b"]})
+    for sheet in ("Process_Set", "Parameter_Input-Output"):
+        path = structure_dir / f"{sheet}.{table_format}"
+        if table_format == "csv":
+            table.to_csv(path, index=False)
+        elif table_format == "json":
+            table.to_json(path, orient="split", index=False)
+        else:
+            table.to_parquet(path, index=False)
+    with pytest.raises(structure.StructureError, match="misses columns"):
+        structure.Structure("incomplete")
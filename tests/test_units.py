@@ -1,5 +1,6 @@
 from data_adapter import unit_conversion
-from pytest import approx
+from pytest import approx, raises
+from units.exception import IncompatibleUnitsError
 
 
 def test_unit_conversion():
@@ -189,3 +190,26 @@ def test_unit_conversion():
     assert unit_conversion.get_conversion_factor("PJ/Million units", "PJ/M_units") == 1
     assert unit_conversion.get_conversion_factor("PJ/Mt", "PJ/Mt") == 1
 
+
+def test_cached_incompatible_units():
+    unit_conversion.clear_conversion_cache()
+    for _ in range(2):
+        with raises(IncompatibleUnitsError):
+            unit_conversion.get_conversion_factor("MW", "EUR")
+        with raises(unit_conversion.UnitConversionError):
+            unit_conversion.get_conversion_factor("MW", "unknown")
+    assert unit_conversion.get_conversion_factor("GW", "MW") == 1e3
+
+
+def test_target_conversion():
+    targets = ["EUR/MWh", "GW", "MW"]
+    assert unit_conversion.get_target_conversion("MW", targets) == ("GW", 1e-3)
+    assert unit_conversion.get_target_conversion("kEUR/MWh", targets) == ("EUR/MWh", approx(1e3))
+    assert unit_conversion.get_target_conversion("t", targets) is None
+    assert unit_conversion.get_target_conversion("unknown", targets) is None
+
+
+def test_conversion_table():
+    table = unit_conversion.get_conversion_table(["GW"], units_from=["kW", "MW", "t"])
+    assert table == {"kW": ("GW", 1e-6), "MW": ("GW", 1e-3), "t": None}
+    assert unit_conversion.get_conversion_table(["GW"])["TW"] == ("GW", 1e3)